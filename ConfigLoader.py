@@ -23,12 +23,55 @@
 
 import yaml
 import fnmatch
+import hashlib
+import json
 import os
+import re
+import tempfile
+
+from collections.abc    import Mapping
+
+# libyaml-backed loader when available, pure-python otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# bump when the layout of the cached bundle changes
+CACHE_VERSION = 2
+
+# symbols remembered per session lookup - past this, new symbols still
+# resolve through the regex, they just aren't memoized
+LOOKUP_CACHE_SIZE = 4096
 
 class ConfigLoader:
 
-    def __init__(self, configPath="configs"):
+    def __init__(self, configPath="configs", useCache=True):
         self.configPath = configPath
+        self.useCache   = useCache
+
+        # parsed yaml keyed by path -> (mtime, data)
+        self._yamlCache = {}
+
+    #
+    # parse a yaml file once, re-parse only if it changed on disk
+    #
+
+    def _loadYaml(self, fileName):
+
+        path  = os.path.join(self.configPath, fileName)
+        mtime = os.path.getmtime(path)
+
+        cached = self._yamlCache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, "r") as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+
+        self._yamlCache[path] = (mtime, data)
+
+        return data
 
     #
     # load engine.yaml
@@ -36,9 +79,7 @@ class ConfigLoader:
 
     def loadEngineConfig(self):
 
-        path = os.path.join(self.configPath, "engine.yaml")
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        data = self._loadYaml("engine.yaml")
 
         if "engine" not in data or "sessions" not in data["engine"]:
             raise Exception("[ERROR] engine.yaml is missing required 'engine.sessions' block")
@@ -51,9 +92,7 @@ class ConfigLoader:
 
     def loadBehaviors(self):
 
-        path = os.path.join(self.configPath, "behaviors.yaml")
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        data = self._loadYaml("behaviors.yaml")
 
         if "behaviors" not in data:
             raise Exception("[ERROR] behaviors.yaml missing top-level 'behaviors:' block")
@@ -71,8 +110,7 @@ class ConfigLoader:
         if not os.path.exists(path):
             raise FileNotFoundError(f"Session config '{fileName}' not found")
 
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        data = self._loadYaml(fileName)
 
         if "session" not in data:
             raise Exception(f"[ERROR] {fileName} missing required 'session:' block")
@@ -97,12 +135,9 @@ class ConfigLoader:
 
             matchPattern = rule["match"]
 
-            # pre-compile match function
-            def matcher(symbol, pat=matchPattern):
-                return fnmatch.fnmatch(symbol, pat)
-
+            # pre-compile match function (glob translated to regex once)
             compiled.append({
-                "matchFn" : matcher,
+                "matchFn" : re.compile(fnmatch.translate(matchPattern)).match,
                 "behavior": behaviorName,
                 "pattern" : matchPattern
             })
@@ -110,15 +145,192 @@ class ConfigLoader:
         return compiled
 
     #
-    # build config bundle at startup
+    # combine compiled rules into a single regex - the first matching rule wins,
+    # same as walking the rule list in order. symbols repeat, so each result is
+    # memoized (a dict hit is ~4-6x cheaper than the regex match)
+    #
+
+    def compileLookup(self, compiledRules):
+
+        if not compiledRules:
+            return lambda symbol: None
+
+        behaviorByGroup = {f"r{idx}": rule["behavior"] for idx, rule in enumerate(compiledRules)}
+
+        combined = re.compile("|".join(
+            f"(?P<r{idx}>{fnmatch.translate(rule['pattern'])})" for idx, rule in enumerate(compiledRules)
+        ))
+
+        memo = {}
+
+        def lookupFn(symbol):
+
+            behavior = memo.get(symbol, memo)
+
+            if behavior is memo:
+                match    = combined.match(symbol)
+                behavior = behaviorByGroup[match.lastgroup] if match else None
+
+                if len(memo) < LOOKUP_CACHE_SIZE:
+                    memo[symbol] = behavior
+
+            return behavior
+
+        return lookupFn
+
+    #
+    # cache key - hash of every yaml file name + mtime under the config dir,
+    # subdirectories included (engine.yaml may point at "desk/fx.yaml")
+    #
+
+    def _cacheKey(self):
+
+        h = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+
+        for root, dirs, files in os.walk(self.configPath):
+
+            dirs.sort()
+
+            for fileName in sorted(files):
+                if fileName.endswith((".yaml", ".yml")):
+                    path = os.path.join(root, fileName)
+                    h.update(f"{path}:{os.path.getmtime(path)}".encode())
+
+        return h.hexdigest()
+
+    def _cachePath(self, cacheKey):
+        return os.path.join(self.configPath, f".cache-{cacheKey}.json")
+
+    #
+    # read the json sidecar (None if missing/unreadable)
+    #
+
+    def _loadCachedBundle(self, cacheKey):
+
+        path = self._cachePath(cacheKey)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+    #
+    # write the json sidecar, drop stale sidecars. several reuse_port processes
+    # may start together - each writes its own temp file, and a sidecar another
+    # process already removed is not an error
     #
 
-    def loadAll(self):
+    def _saveCachedBundle(self, cacheKey, bundle):
+
+        path    = self._cachePath(cacheKey)
+        tmpPath = None
 
-        engineCfg = self.loadEngineConfig()
-        behaviors = self.loadBehaviors()
+        try:
+            fd, tmpPath = tempfile.mkstemp(dir=self.configPath, prefix=".cache-", suffix=".tmp")
+
+            with os.fdopen(fd, "w") as f:
+                json.dump(bundle, f)
+
+            os.replace(tmpPath, path)
+
+        except (OSError, TypeError, ValueError):
+            # read-only config dir or non-json yaml values (dates) - run uncached
+            if tmpPath and os.path.exists(tmpPath):
+                os.remove(tmpPath)
+            return
+
+        for fileName in os.listdir(self.configPath):
+            stale = os.path.join(self.configPath, fileName)
+            if fileName.startswith(".cache-") and fileName.endswith(".json") and stale != path:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    #
+    # session bundle entry <-> json (match closures can't be serialized). the
+    # raw yaml tree is left out - it would double the sidecar, and a restored
+    # session re-reads it only if rawProfile is asked for
+    #
+
+    def _sessionToCache(self, session):
+
+        execution = {k: v for k, v in session["execution"].items() if k != "lookupFn"}
+        execution["rules"] = [{"match": r["pattern"], "behavior": r["behavior"]} for r in execution["rules"]]
+
+        return {**{k: v for k, v in session.items() if k != "rawProfile"}, "execution": execution}
+
+    def _sessionFromCache(self, cached, behaviors, fileName):
+
+        compiledRules = self.compileRules(cached["execution"]["rules"], behaviors)
+
+        execution = {**cached["execution"], "rules": compiledRules, "lookupFn": self.compileLookup(compiledRules)}
+
+        return CachedSession({**cached, "execution": execution}, self, fileName)
+
+    #
+    # parse + compile a single enabled session
+    #
 
-        sessionBundle = {}
+    def loadSession(self, name, fileName, behaviors):
+
+        profile = self.loadSessionProfile(fileName)
+
+        # full yaml - already parsed by loadSessionProfile()
+        fullYaml = self._loadYaml(fileName)
+
+        if "execution" not in fullYaml or "rules" not in fullYaml["execution"]:
+            raise Exception(f"[ERROR] {fileName} missing execution.rules block")
+
+        compiledRules = self.compileRules(
+            fullYaml["execution"]["rules"],
+            behaviors
+        )
+
+        return {
+            "profileName": profile.get("name", name),
+            "role": profile.get("role", "initiator"),
+
+            # schedule *IS* inside session:
+            "schedule": profile.get("schedule", {}),
+
+            # connection is TOP-LEVEL:
+            "connection": fullYaml.get("connection", {}),
+
+            # execution is TOP-LEVEL:
+            "execution": {
+                "defaultBehavior": fullYaml["execution"].get("default_behavior"),
+                "rules": compiledRules,
+                "lookupFn": self.compileLookup(compiledRules)
+            },
+
+            # keep the full YAML if needed later
+            "rawProfile": fullYaml
+        }
+
+    #
+    # build config bundle at startup - session profiles are only parsed when
+    # first accessed through bundle["sessions"], unless preload is set
+    #
+
+    def loadAll(self, preload=False):
+
+        cacheKey = self._cacheKey() if self.useCache else None
+        cached   = self._loadCachedBundle(cacheKey) if cacheKey else None
+
+        if cached:
+            engineCfg = cached["engine"]
+            behaviors = cached["behaviors"]
+        else:
+            engineCfg = self.loadEngineConfig()
+            behaviors = self.loadBehaviors()
+
+        enabledFiles = {}
 
         for entry in engineCfg["sessions"]:
 
@@ -133,44 +345,140 @@ class ConfigLoader:
             if not enabled:
                 continue 
 
-            profile = self.loadSessionProfile(fileName)
+            enabledFiles[name] = fileName
 
-            # load the full yaml 
-            fullPath = os.path.join(self.configPath, fileName)
+        sessionBundle = LazySessions(
+            self, enabledFiles, engineCfg, behaviors,
+            cacheKey=cacheKey,
+            cachedSessions=cached["sessions"] if cached else {}
+        )
 
-            with open(fullPath, "r") as f:
-                fullYaml = yaml.safe_load(f)
+        if preload:
+            sessionBundle.preload()
 
-            if "execution" not in fullYaml or "rules" not in fullYaml["execution"]:
-                raise Exception(f"[ERROR] {fileName} missing execution.rules block")
+        return {
+            "engine"    : engineCfg,
+            "behaviors" : behaviors,
+            "sessions"  : sessionBundle
+        }
 
-            compiledRules = self.compileRules(
-                fullYaml["execution"]["rules"],
-                behaviors
-            )
 
-            sessionBundle[name] = {
-                "profileName": profile.get("name", name),
-                "role": profile.get("role", "initiator"),
+###############################################################################
+#
+# Class       : LazySessions
+#
+# Description : Read-only mapping of enabled session name -> session bundle.
+#             : Each session is parsed/compiled (or restored from the json
+#             : sidecar) the first time it is looked up.
+#
+###############################################################################
 
-                # schedule *IS* inside session:
-                "schedule": profile.get("schedule", {}),
+class LazySessions(Mapping):
 
-                # connection is TOP-LEVEL:
-                "connection": fullYaml.get("connection", {}),
+    def __init__(self, loader, enabledFiles, engineCfg, behaviors, cacheKey=None, cachedSessions=None):
 
-                # execution is TOP-LEVEL:
-                "execution": {
-                    "defaultBehavior": fullYaml["execution"].get("default_behavior"),
-                    "rules": compiledRules
-                },
+        self.loader       = loader
+        self.enabledFiles = enabledFiles
+        self.engineCfg    = engineCfg
+        self.behaviors    = behaviors
+        self.cacheKey     = cacheKey
 
-                # keep the full YAML if needed later
-                "rawProfile": fullYaml
-            }
+        # json form of every session compiled so far (what goes in the sidecar)
+        self.cachedSessions = dict(cachedSessions or {})
 
-        return {
-            "engine"    : engineCfg,
-            "behaviors" : behaviors,
-            "sessions"  : sessionBundle
-        }
+        self.loaded = {}
+
+    def __getitem__(self, name):
+
+        if name in self.loaded:
+            return self.loaded[name]
+
+        if name not in self.enabledFiles:
+            raise KeyError(name)
+
+        session = self._loadOne(name)
+
+        self.loaded[name] = session
+
+        if name not in self.cachedSessions and self.cacheKey:
+            self.cachedSessions[name] = self.loader._sessionToCache(session)
+            self._saveSidecar()
+
+        return session
+
+    #
+    # parse/compile every session not loaded yet, sidecar written once. in
+    # sequence - CSafeLoader holds the GIL, a thread pool measured slower.
+    # startup normally skips this, lazy lookup only parses what is used
+    #
+
+    def preload(self):
+
+        dirty = False
+
+        # engine.yaml order
+        for name in self.enabledFiles:
+
+            if name in self.loaded:
+                continue
+
+            session = self._loadOne(name)
+
+            self.loaded[name] = session
+
+            if name not in self.cachedSessions and self.cacheKey:
+                self.cachedSessions[name] = self.loader._sessionToCache(session)
+                dirty = True
+
+        if dirty:
+            self._saveSidecar()
+
+    def _loadOne(self, name):
+
+        if name in self.cachedSessions:
+            return self.loader._sessionFromCache(self.cachedSessions[name], self.behaviors, self.enabledFiles[name])
+
+        return self.loader.loadSession(name, self.enabledFiles[name], self.behaviors)
+
+    def _saveSidecar(self):
+
+        self.loader._saveCachedBundle(self.cacheKey, {
+            "engine"    : self.engineCfg,
+            "behaviors" : self.behaviors,
+            "sessions"  : self.cachedSessions
+        })
+
+    def __iter__(self):
+        return iter(self.enabledFiles)
+
+    def __len__(self):
+        return len(self.enabledFiles)
+
+
+###############################################################################
+#
+# Class       : CachedSession
+#
+# Description : Session bundle restored from the json sidecar. rawProfile is
+#             : not cached - session["rawProfile"] parses the session yaml
+#             : on first access (.get() and "in" don't trigger the load).
+#
+###############################################################################
+
+class CachedSession(dict):
+
+    def __init__(self, data, loader, fileName):
+
+        super().__init__(data)
+
+        self.loader   = loader
+        self.fileName = fileName
+
+    def __missing__(self, key):
+
+        if key != "rawProfile":
+            raise KeyError(key)
+
+        self["rawProfile"] = self.loader._loadYaml(self.fileName)
+
+        return self["rawProfile"]
@@ -21,17 +21,17 @@
 
 import os
 import sys
-import yaml
+import signal
 import logging
+import logging.handlers
 import argparse
 
-from cert.validator  import CertificationValidator
-from ConfigLoader    import ConfigLoader
 from datetime        import datetime
-from emulator.server import FixEmulatorServer
-from ScenarioEngine  import ScenarioEngine
 
-TODAY = datetime.now().strftime("%Y%m%d")
+# file log batching - records buffered before a write, and the longest an
+# INFO record waits (flushed sooner on WARNING+, a full buffer or exit)
+LOG_BUFFER_RECORDS   = 64
+LOG_FLUSH_INTERVAL_S = 1.0
 
 # let's add some color
 BLUE   = '\033[94m'
@@ -56,7 +56,12 @@ def InitializeLogging():
 
     os.makedirs("logs", exist_ok=True)
 
-    logfile = f"logs/{TODAY}.txt"
+    logfile = f"logs/{datetime.now().strftime('%Y%m%d')}.txt"
+
+    # batch file writes - flushed every LOG_BUFFER_RECORDS records, on WARNING+,
+    # every LOG_FLUSH_INTERVAL_S while emulating, and on exit / SIGTERM / SIGINT
+    fileHandler = logging.FileHandler(logfile, mode='a')  # Append mode
+    fileHandler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
 
     logging.basicConfig(
 
@@ -64,12 +69,91 @@ def InitializeLogging():
         format='%(asctime)s [%(levelname)s] %(message)s',
 
         handlers=[
-            logging.FileHandler(logfile, mode='a'),  # Append mode
+            logging.handlers.MemoryHandler(capacity=LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=fileHandler),
             logging.StreamHandler()  # Also log to console
         ]
 
     )
 
+    # a kill must not drop the buffered tail of the session log
+    signal.signal(signal.SIGTERM, ShutdownOnSignal)
+    signal.signal(signal.SIGINT, ShutdownOnSignal)
+
+
+###############################################################################
+#
+# Procedure   : ShutdownOnSignal()
+#
+# Description : SIGTERM/SIGINT handler - write out buffered log records,
+#             : then exit as the signal would have.
+#
+# Input       : signum - signal number
+#             : frame  - interrupted stack frame (unused)
+#
+# Returns     : -none- (raises SystemExit / KeyboardInterrupt)
+#
+###############################################################################
+
+def ShutdownOnSignal(signum, frame):
+
+    logging.info("Signal %d received, shutting down", signum)
+    logging.shutdown()
+
+    if signum == signal.SIGINT:
+        raise KeyboardInterrupt
+
+    sys.exit(128 + signum)
+
+
+###############################################################################
+#
+# Procedure   : FlushLogsPeriodically()
+#
+# Description : Push buffered log records to their targets every interval,
+#             : so the session file keeps up (tail -f) between flushes.
+#
+# Input       : interval - seconds between flushes
+#
+# Returns     : -none- (runs until cancelled)
+#
+###############################################################################
+
+async def FlushLogsPeriodically(interval=LOG_FLUSH_INTERVAL_S):
+
+    import asyncio
+
+    while True:
+
+        await asyncio.sleep(interval)
+
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
+
+###############################################################################
+#
+# Procedure   : ServeWithLogFlush()
+#
+# Description : Run the emulator with the periodic log flush alongside it.
+#
+# Input       : emulator - FixEmulatorServer
+#
+# Returns     : -none-
+#
+###############################################################################
+
+async def ServeWithLogFlush(emulator):
+
+    import asyncio
+
+    flusher = asyncio.create_task(FlushLogsPeriodically())
+
+    try:
+        await emulator.Start()
+
+    finally:
+        flusher.cancel()
+
 
 ###############################################################################
 #
@@ -106,7 +190,7 @@ def ParseArgs():
 
     parser.add_argument(
         "--mode",
-        choices=["emulate", "certify"],
+        choices=list(MODES),
         required=True,
         help="🧭 Mode to run: 'emulate' for mock FIX session, 'certify' to analyze a FIX log.",
     )
@@ -123,108 +207,221 @@ def ParseArgs():
         help="📄 Path to FIX log file for certification (required for certify mode).",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        dest="noCache",
+        action="store_true",
+        help="🧹 Ignore the compiled config cache and re-parse every YAML file.",
+    )
+
     return parser.parse_args()
 
 
 ###############################################################################
-#             
-# Procedure   : Main()
 #
-# Description : Entry point.
-#     
-# Input       : -none-    
-#              
+# Procedure   : ApplyCpuAffinity()
+#
+# Description : Pin the emulator process (event loop + scenario tasks) to a
+#             : set of CPUs, e.g. the cores local to the NIC's NUMA node, so
+#             : softirq and handler share an L3 domain.
+#
+# Input       : setting - CPU id or list of CPU ids, or a NIC name ("eth0")
+#             :           whose NUMA node's CPUs are used, None/empty to skip
+#
 # Returns     : -none-
-#     
+#
 ###############################################################################
 
-def Main():
+def ApplyCpuAffinity(setting):
 
-    args = ParseArgs()
+    # a single core - "cpu_affinity: 3" (0 included, so before the empty check)
+    if isinstance(setting, int) and not isinstance(setting, bool):
+        setting = [setting]
 
-    InitializeLogging()
+    if not setting or not hasattr(os, "sched_setaffinity"):
+        return
 
-    #
-    # emulate
-    #
+    if isinstance(setting, str):
 
-    if args.mode == "emulate":
+        nodePath = f"/sys/class/net/{setting}/device/numa_node"
 
-        if not args.config:
-            print("[ERROR] --config is required for emulate mode")
-            sys.exit(1)
+        # virtual NICs (veth, bridges) have no device / NUMA locality
+        if not os.path.isfile(nodePath):
+            logging.warning(f"No NUMA info for NIC '{setting}', CPU affinity not set")
+            return
 
-        print(f"[INFO] Loading emulator config: {args.config}")
+        with open(nodePath) as file:
+            node = int(file.read())
 
-        print(f"[INFO] Booting FixEm via engine.yaml")
+        # -1 - single node box, nothing to pin to
+        if node < 0:
+            logging.warning(f"NIC '{setting}' has no NUMA node, CPU affinity not set")
+            return
 
-        try:
-            # load all configs (engine, behaviors, sessions)
-            cfgLoader = ConfigLoader("configs")
-            configBundle = cfgLoader.loadAll()
+        with open(f"/sys/devices/system/node/node{node}/cpulist") as file:
+            cpus = set()
+            for part in file.read().strip().split(","):
+                first, _, last = part.partition("-")
+                cpus.update(range(int(first), int(last or first) + 1))
+    elif isinstance(setting, list) and all(isinstance(cpu, int) and not isinstance(cpu, bool) for cpu in setting):
+        cpus = set(setting)
 
-            # create scenario engine
-            scenarioEngine = ScenarioEngine(configBundle["behaviors"])
+    else:
+        raise ValueError(f"cpu_affinity must be a CPU id, a list of CPU ids or a NIC name, got {setting!r}")
 
-            # start only the first session (todo - wire multi-session server)
-            sessions = configBundle["sessions"]
-            if not sessions:
-                print("[ERROR] No enabled sessions in engine.yaml")
-                sys.exit(1)
+    os.sched_setaffinity(0, cpus)
+    logging.info(f"CPU affinity: {sorted(cpus)}")
 
-            # grab first session config (equities) 
-            sessionName, sessionCfg = next(iter(sessions.items()))
-            conn = sessionCfg["connection"]
 
-            print(f"[INFO] Starting session '{sessionName}' at {conn['host']}:{conn['port']}")
+###############################################################################
+#
+# Procedure   : RunEmulate()
+#
+# Description : Load engine.yaml and start the first enabled session.
+#
+# Input       : args (Namespace) - parsed command line arguments
+#
+# Returns     : -none-
+#
+###############################################################################
 
-            emulator = FixEmulatorServer(
-                host=conn["host"],
-                port=conn["port"],
-                senderCompID=conn["sender_comp_id"],
-                targetCompID=conn["target_comp_id"],
-                heartBtInt=conn["heartbtint"],
-                scenarioEngine=scenarioEngine,
-                sessionConfig=sessionCfg
-            )
+def RunEmulate(args):
 
-            emulator.Start()
+    if not args.config:
+        print("[ERROR] --config is required for emulate mode")
+        sys.exit(1)
 
-        except Exception as e:
-            print(f"[ERROR] Failed to start emulator: {str(e)}")
-            sys.exit(2)
+    # emulate-only imports (yaml, asyncio, sockets) - certify never pays for them
+    import asyncio
 
-    #
-    # certify
-    #
+    from ConfigLoader    import ConfigLoader
+    from emulator.server import FixEmulatorServer
+    from ScenarioEngine  import ScenarioEngine
 
-    elif args.mode == "certify":
+    print(f"[INFO] Loading emulator config: {args.config}")
 
-        if not args.log:
-            print("[ERROR] --log is required for certify mode")
-            sys.exit(1)
+    print(f"[INFO] Booting FixEm via engine.yaml")
+
+    try:
+        # load all configs (engine, behaviors, sessions)
+        cfgLoader = ConfigLoader("configs", useCache=not args.noCache)
+        configBundle = cfgLoader.loadAll()
 
-        print(f"[INFO] Certifying FIX Log: {args.log}")
+        # create scenario engine
+        scenarioEngine = ScenarioEngine(configBundle["behaviors"])
 
+        # start only the first session (todo - wire multi-session server)
+        sessions = configBundle["sessions"]
+        if not sessions:
+            print("[ERROR] No enabled sessions in engine.yaml")
+            sys.exit(1)
+
+        # grab first session config (equities) 
+        sessionName, sessionCfg = next(iter(sessions.items()))
+        conn = sessionCfg["connection"]
+
+        print(f"[INFO] Starting session '{sessionName}' at {conn['host']}:{conn['port']}")
+
+        emulator = FixEmulatorServer(
+            host=conn["host"],
+            port=conn["port"],
+            senderCompID=conn["sender_comp_id"],
+            targetCompID=conn["target_comp_id"],
+            heartBtInt=conn["heartbtint"],
+            scenarioEngine=scenarioEngine,
+            sessionConfig=sessionCfg,
+            maxSessions=conn.get("max_sessions", 64),
+            reusePort=conn.get("reuse_port", False),
+            socketBuffer=conn.get("socket_buffer", 0)
+        )
+
+        # before the loop starts, so every task runs on the pinned cores
+        ApplyCpuAffinity(conn.get("cpu_affinity"))
+
+        # uvloop is optional - same asyncio API on a libuv loop when installed
         try:
-            validator = CertificationValidator(args.log)
-            validator.LoadLog()
-            validator.ParseMessages()
-            results = validator.ValidateMessages()
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logging.info("Event loop: uvloop")
+        except ImportError:
+            pass
 
-            print("--- Certification Results ---")
-            for label, message in results:
-                print(f"  {label:8} {message}")
-            print("")
+        asyncio.run(ServeWithLogFlush(emulator))
 
-        except Exception as e:
-            print(f"[ERROR] Certification failed: {str(e)}")
-            sys.exit(2)
+    except Exception as e:
+        print(f"[ERROR] Failed to start emulator: {str(e)}")
+        sys.exit(2)
 
-    else:
+
+###############################################################################
+#
+# Procedure   : RunCertify()
+#
+# Description : Validate a FIX log and print the results.
+#
+# Input       : args (Namespace) - parsed command line arguments
+#
+# Returns     : -none-
+#
+###############################################################################
+
+def RunCertify(args):
+
+    if not args.log:
+        print("[ERROR] --log is required for certify mode")
+        sys.exit(1)
+
+    from cert.validator import CertificationValidator
+
+    print(f"[INFO] Certifying FIX Log: {args.log}")
+
+    try:
+        validator = CertificationValidator(args.log)
+        results   = validator.IterValidate()
+
+        print("--- Certification Results ---")
+        for label, message in results:
+            print(f"  {label:8} {message}")
+        print("")
+
+    except Exception as e:
+        print(f"[ERROR] Certification failed: {str(e)}")
+        sys.exit(2)
+
+
+# --mode -> runner
+MODES = {
+    "emulate": RunEmulate,
+    "certify": RunCertify,
+}
+
+
+###############################################################################
+#             
+# Procedure   : Main()
+#
+# Description : Entry point.
+#     
+# Input       : -none-    
+#              
+# Returns     : -none-
+#     
+###############################################################################
+
+def Main():
+
+    args = ParseArgs()
+
+    InitializeLogging()
+
+    runner = MODES.get(args.mode)
+
+    if not runner:
         print("[ERROR] Invalid mode selected")
         sys.exit(1)
 
+    runner(args)
+
 
 if __name__ == "__main__":
     Main()
@@ -20,7 +20,15 @@
 #     Changes  :
 #
 
-import time
+import asyncio
+import logging
+import threading
+
+log = logging.getLogger("scenario")
+
+# default wait_for limit in ms (a step can set its own "timeout") - an order
+# that never gets its event must not hold its task and order state forever
+WAIT_FOR_TIMEOUT = 300_000
 
 class ScenarioEngine:
 
@@ -30,53 +38,148 @@ class ScenarioEngine:
         """
         self.behaviors = behaviorsDict
 
+        # one event loop services every in-flight scenario - the caller's loop
+        # when first used from a coroutine (the server), else a background thread
+        self.loop       = None
+        self.loopThread = None
+        self.loopLock   = threading.Lock()
+
+        # strong refs to in-flight tasks (the loop only keeps weak ones)
+        self.tasks = set()
+
+    #
+    # bind the scenario event loop on first use
+    #
+
+    def _ensureLoop(self):
+
+        with self.loopLock:
+
+            if self.loop is None:
+
+                try:
+                    self.loop = asyncio.get_running_loop()
+
+                except RuntimeError:
+                    self.loop       = asyncio.new_event_loop()
+                    self.loopThread = threading.Thread(target=self.loop.run_forever, name="scenario-loop", daemon=True)
+                    self.loopThread.start()
+
+        return self.loop
+
+    def _onLoop(self):
+
+        try:
+            return asyncio.get_running_loop() is self._ensureLoop()
+
+        except RuntimeError:
+            return False
+
+    #
+    # schedule a behavior on the scenario loop - returns immediately
+    #
+
+    def schedule(self, orderObj, behaviorName):
+
+        orderObj["running"] = True
+
+        if self._onLoop():
+            future = self.loop.create_task(self.runBehavior(orderObj, behaviorName))
+            self.tasks.add(future)
+            future.add_done_callback(self.tasks.discard)
+        else:
+            future = asyncio.run_coroutine_threadsafe(self.runBehavior(orderObj, behaviorName), self._ensureLoop())
+
+        future.add_done_callback(lambda f: self._reportFailure(f, orderObj, behaviorName))
+
+        return future
+
+    def _reportFailure(self, future, orderObj, behaviorName):
+
+        if not future.cancelled() and future.exception():
+            log.error(f"[scenario] Behavior '{behaviorName}' failed for order {orderObj['clOrdID']}: {future.exception()}")
+
+    #
+    # wake a scenario blocked in wait_for (thread safe). an event that arrives
+    # before the wait_for step is latched, so the step won't block.
+    #
+
+    def signal(self, orderObj, eventName):
+
+        if self._onLoop():
+            self._setEvent(orderObj, eventName)
+        else:
+            self._ensureLoop().call_soon_threadsafe(self._setEvent, orderObj, eventName)
+
+    def _setEvent(self, orderObj, eventName):
+
+        if orderObj.get("waitingFor") == eventName:
+            orderObj["waitingFor"] = None
+
+        orderObj.setdefault("events", {}).setdefault(eventName, asyncio.Event()).set()
+
     #
     # entry point - run a behavior by name on an order object.
     #
 
-    def runBehavior(self, orderObj, behaviorName):
-        if behaviorName not in self.behaviors:
-            raise Exception(f"[ERROR] Behavior '{behaviorName}' not found.")
+    async def runBehavior(self, orderObj, behaviorName):
+
+        orderObj["running"] = True
+
+        try:
+            if behaviorName not in self.behaviors:
+                raise Exception(f"[ERROR] Behavior '{behaviorName}' not found.")
 
-        scenarioSteps = self.behaviors[behaviorName].get("scenario", [])
+            scenarioSteps = self.behaviors[behaviorName].get("scenario", [])
 
-        print(f"[scenario] Starting behavior '{behaviorName}' for order {orderObj['clOrdID']}")
+            log.info("[scenario] Starting behavior '%s' for order %s", behaviorName, orderObj["clOrdID"])
 
-        for idx, step in enumerate(scenarioSteps, start=1):
-            self.executeStep(idx, step, orderObj)
+            for idx, step in enumerate(scenarioSteps, start=1):
+                if await self.executeStep(idx, step, orderObj):
+                    log.info("[scenario] Stopped behavior '%s' for order %s at step %d", behaviorName, orderObj["clOrdID"], idx)
+                    return
 
-        print(f"[scenario] Completed behavior '{behaviorName}' for order {orderObj['clOrdID']}'")
+            log.info("[scenario] Completed behavior '%s' for order %s'", behaviorName, orderObj["clOrdID"])
+
+        finally:
+            orderObj["running"] = False
 
     #
-    # execute a single scenario step 
+    # execute a single scenario step - True stops the behavior
     #
 
-    def executeStep(self, stepNo, step, orderObj):
+    async def executeStep(self, stepNo, step, orderObj):
+
+        # per-step traces are debug only, skip formatting them otherwise
+        trace = log.isEnabledFor(logging.DEBUG)
 
         # send: something
         if "send" in step:
             msgType = step["send"]
-            print(f"[scenario] step {stepNo}: send '{msgType}'")
+            if trace:
+                log.debug(f"[scenario] step {stepNo}: send '{msgType}'")
             self.handleSend(msgType, orderObj)
             return
 
         # delay: ms
         if "delay" in step:
             ms = step["delay"]
-            print(f"[scenario] step {stepNo}: delay {ms} ms")
-            time.sleep(ms / 1000.0)
+            if trace:
+                log.debug(f"[scenario] step {stepNo}: delay {ms} ms")
+            await asyncio.sleep(ms / 1000.0)
             return
 
         # wait_for: event-name
         if "wait_for" in step:
             event = step["wait_for"]
-            print(f"[scenario] step {stepNo}: wait_for '{event}'")
-            self.handleWaitFor(event, orderObj)
-            return
+            if trace:
+                log.debug(f"[scenario] step {stepNo}: wait_for '{event}'")
+            return not await self.handleWaitFor(event, orderObj, step.get("timeout", WAIT_FOR_TIMEOUT))
 
         # end: true
         if "end" in step:
-            print(f"[scenario] step {stepNo}: end of scenario")
+            if trace:
+                log.debug(f"[scenario] step {stepNo}: end of scenario")
             return
 
         # unknown step type
@@ -90,16 +193,38 @@ class ScenarioEngine:
         server = orderObj.get("server")
 
         if server is None:
-            print(f"[exec] ERROR: no server reference on order object → cannot send '{msgType}' FIX exec")
+            log.error(f"[exec] no server reference on order object → cannot send '{msgType}' FIX exec")
             return
 
         # call back into emulator to generate and send exec report
         server.HandleScenarioAction(orderObj, msgType)
 
     #
-    # Placeholder: wait for cancel/replace/etc.
-    # Will integrate with server message router later.
+    # wait for cancel/replace/etc. - the server calls signal() when it arrives.
+    # False if timeoutMs passed first.
     #
-    def handleWaitFor(self, eventName, orderObj):
-        print(f"[wait] Would block until event '{eventName}' occurs on order {orderObj['clOrdID']}")
-        # TODO: integrate with async event queue when server supports it
+    async def handleWaitFor(self, eventName, orderObj, timeoutMs=WAIT_FOR_TIMEOUT):
+
+        event = orderObj.setdefault("events", {}).setdefault(eventName, asyncio.Event())
+
+        log.info("[wait] Waiting for event '%s' on order %s", eventName, orderObj["clOrdID"])
+
+        # the server checks this to decide between signal() and a new scenario
+        if not event.is_set():
+            orderObj["waitingFor"] = eventName
+
+        try:
+            await asyncio.wait_for(event.wait(), timeoutMs / 1000.0)
+
+        except asyncio.TimeoutError:
+            log.warning("[wait] Event '%s' not received within %d ms on order %s", eventName, timeoutMs, orderObj["clOrdID"])
+            return False
+
+        finally:
+            if orderObj.get("waitingFor") == eventName:
+                orderObj["waitingFor"] = None
+
+        # re-arm so a later wait_for on the same event waits for the next one
+        event.clear()
+
+        return True
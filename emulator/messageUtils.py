@@ -1,31 +1,127 @@
+import time
 import zlib
 
-SOH = '\x01'
+SOH   = '\x01'
+SOH_B = b'\x01'
+
+# static header prefix / tags BuildFixMessage computes itself
+BEGIN     = b'8=FIX.4.2' + SOH_B
+_EXCLUDED = frozenset(("8", "9", "10"))
 
 def BuildFixMessage(fields):
-    body = SOH.join([f"{tag}={value}" for tag, value in fields.items() if tag != "8" and tag != "9" and tag != "10"]) + SOH
-    bodyLength = len(body)
-    header = f"8=FIX.4.2{SOH}9={bodyLength}{SOH}"
-    msgWithoutChecksum = header + body
-    checksum = CalculateChecksum(msgWithoutChecksum)
-    fullMessage = msgWithoutChecksum + f"10={checksum:03}{SOH}"
-    return fullMessage
+    # encode the body once, then frame it
+    body = "".join([f"{tag}={value}{SOH}" for tag, value in fields.items() if tag not in _EXCLUDED]).encode()
+    return _FrameBody(body)
+
+
+def CompileFixTemplate(fields):
+    # fields as for BuildFixMessage, None marks a per-message slot - fixed
+    # values are rendered once here, slots become %s in tag order
+    return "".join([f"{tag}={'%s' if value is None else str(value).replace('%', '%%')}{SOH}"
+                    for tag, value in fields.items() if tag not in _EXCLUDED])
+
+
+def BuildFromTemplate(template, values):
+    # one % format + one encode instead of a dict build and a join per field
+    return _FrameBody((template % values).encode())
+
+
+def _FrameBody(body):
+    # header + body + trailer in one bytes format - no scratch bytearray to
+    # grow and then copy out, the message is allocated exactly once
+    head = b"%s9=%d\x01" % (BEGIN, len(body))
+    return b"%s%s10=%03d\x01" % (head, body, (_ByteSum(head) + _ByteSum(body)) & 0xFF)
+
+
+def _ByteSum(data):
+    # adler32 seeded with 0 keeps the plain byte sum in its low 16 bits - exact
+    # while no mod 65521 happens, i.e. up to 256 bytes (256 * 255 < 65521).
+    # one C call, ~4x faster than sum() on a typical reply
+    if len(data) <= 256:
+        return zlib.adler32(data, 0) & 0xFFFF
+
+    view = memoryview(data)
+    return sum([zlib.adler32(view[i:i + 256], 0) & 0xFFFF for i in range(0, len(data), 256)])
 
 
 def CalculateChecksum(message):
-    return sum(bytearray(message, "utf-8")) % 256
+    if isinstance(message, str):
+        message = message.encode()
+    return _ByteSum(message) & 0xFF
 
 
-def ParseFixMessage(raw):
+def CalculateChecksumsBatch(messages):
+
+    # numpy is optional and only imported here - the server imports this
+    # module but never batches, so it doesn't pay numpy's import cost
     try:
-        fields = {}
-        parts = raw.strip().split(SOH)
-        for field in parts:
-            if "=" in field:
-                tag, value = field.split("=", 1)
-                fields[tag] = value
-        return fields
-    except Exception as e:
-        print(f"[ERROR] Failed to parse FIX message: {e}")
-        return None
+        import numpy
+    except ImportError:
+        numpy = None
+
+    messages = [m.encode() if isinstance(m, str) else m for m in messages]
+
+    # reduceat can't express an empty slice, let the per-message path handle those
+    if numpy is None or not messages or not all(messages):
+        return [_ByteSum(m) & 0xFF for m in messages]
+
+    starts = numpy.cumsum([0] + [len(m) for m in messages[:-1]])
+    sums   = numpy.add.reduceat(numpy.frombuffer(b"".join(messages), dtype=numpy.uint8), starts, dtype=numpy.uint64)
+    return (sums & 0xFF).tolist()
+
+
+# (epoch second, "YYYYMMDD-HH:MM:SS") - strftime only runs once per second
+_secondCache = (None, "")
+
+# (epoch ms, full SendingTime) - a burst inside one ms reuses the whole stamp
+_milliCache = (None, "")
+
+# ".000" .. ".999" - the ms suffix is a list index, not a %03d format
+_MILLIS = [f".{ms:03d}" for ms in range(1000)]
+
+def FixTimestamp(now=None):
+    # now - optional time.time() reading, so one clock read can feed ids too
+    if now is None:
+        return FixTimestampNs(time.time_ns())
+
+    return FixTimestampNs(int(now * 1_000_000_000))
+
+
+def FixTimestampNs(clockNs):
+    # clockNs - time.time_ns() reading, integer math only (no float rounding)
+    global _secondCache, _milliCache
+
+    milli = clockNs // 1_000_000
+
+    cachedMilli, stamp = _milliCache
+
+    if milli == cachedMilli:
+        return stamp
+
+    sec, ms = divmod(milli, 1000)
+
+    cachedSec, prefix = _secondCache
+
+    if sec != cachedSec:
+        prefix = time.strftime("%Y%m%d-%H:%M:%S", time.gmtime(sec))
+        _secondCache = (sec, prefix)
+
+    stamp = prefix + _MILLIS[ms]
+    _milliCache = (milli, stamp)
+
+    return stamp
+
+
+def ParseFixMessage(raw):
+    # bytes in (straight off the socket) or str, decoded once
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode("utf-8", "replace")
 
+    # partition per field measured faster than a regex findall here, and
+    # neither can raise on a malformed fragment - it's just skipped
+    fields = {}
+    for field in raw.strip().split(SOH):
+        tag, sep, value = field.partition("=")
+        if sep:
+            fields[tag] = value
+    return fields
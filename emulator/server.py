@@ -23,35 +23,189 @@
 #     Changes  :
 #
 
+import asyncio
+import itertools
 import logging
 import socket
-import threading
-from datetime import datetime
-from emulator.messageUtils import BuildFixMessage, ParseFixMessage
+import time
+from collections import deque
+from emulator.messageUtils import BuildFromTemplate, CompileFixTemplate, FixTimestamp, FixTimestampNs, ParseFixMessage
 
-SOH = '\x01'
+SOH   = '\x01'
+SOH_B = b'\x01'
 
-class FixEmulatorServer:
+# every message starts here (FIX.4.x and FIXT.1.1)
+BEGIN_STRING = b'8=FIX'
+
+#
+# per-MsgType required tags (tag -> name, checked in order) - built once
+#
 
-    orders = {}
+NEW_ORDER_REQUIRED = {
+    "11": "ClOrdID",
+    "54": "Side",
+    "38": "OrderQty",
+    "55": "Symbol",
+    "40": "OrdType",
+}
+
+CANCEL_REQUIRED = {
+    "11": "ClOrdID",
+    "41": "OrigClOrdID",
+    "55": "Symbol",
+    "54": "Side",
+}
+
+REPLACE_REQUIRED = {
+    "11": "ClOrdID",
+    "41": "OrigClOrdID",
+    "55": "Symbol",
+    "54": "Side",
+    "38": "OrderQty",
+    "40": "OrdType",
+}
+
+VALID_ORD_TYPES = frozenset(("1", "2"))
+
+# order states a scenario action can no longer change
+TERMINAL_STATUSES = frozenset(("CANCELED", "FILLED"))
+
+# ClOrdIDs kept per order - oldest drop off, a long-lived order that is
+# replaced/cancelled over and over no longer grows without bound
+ORDER_HISTORY = 16
+
+class FixEmulatorServer:
 
     def __init__(self, host, port, senderCompID, targetCompID, heartBtInt=30,
-                 scenarioEngine=None, sessionConfig=None):
+                 scenarioEngine=None, sessionConfig=None, maxSessions=64, reusePort=False,
+                 socketBuffer=0):
 
         self.host           = host
         self.port           = port
         self.senderCompID   = senderCompID
         self.targetCompID   = targetCompID
         self.heartBtInt     = heartBtInt
-        self.serverSocket   = None
-        self.outSeq         = 1
+        self.server         = None
+
+        # SO_REUSEPORT - several emulator processes can listen on one port and
+        # the kernel spreads new connections over them (each owns its orders)
+        self.reusePort      = reusePort
+
+        # fixed SO_SNDBUF/SO_RCVBUF for accepted sockets, 0 leaves the kernel
+        # autotuning them (asyncio already sets TCP_NODELAY)
+        self.socketBuffer   = socketBuffer
+
+        # bound on concurrently served connections, the rest queue in accept order
+        self.sessionSlots   = asyncio.Semaphore(maxSessions)
+
+        # StreamWriter -> that connection's outbound MsgSeqNum counter. replies
+        # and scenario execs share it, so 34 is one gap-free series per session
+        self.sessionSeq     = {}
+
+        # order book for this server only (ClOrdID -> order state)
+        self.orders         = {}
 
         # scenario engine wiring
         self.scenarioEngine = scenarioEngine
         self.sessionConfig  = sessionConfig
 
-        # simple seq counter for scenario-generated execs
-        self.scenarioSeqNum = 100000
+        # MsgType (35) -> handler
+        self.handlers = {
+            "A": self._handleLogon,
+            "0": self._handleHeartbeat,
+            "5": self._handleLogout,
+            "D": self._handleNewOrder,
+            "F": self._handleCancel,
+            "G": self._handleReplace,
+        }
+
+        # EX/OR ids - server start ms (fixed 13 digits, keeps ids unique across
+        # restarts) + a monotonic counter, no clock formatting per id
+        self.idPrefix       = str(time.time_ns() // 1_000_000)
+        self.idSeq          = itertools.count(1).__next__
+
+        # reply templates - CompIDs are rendered once, None slots are
+        # filled per message in the order listed
+        self._compileTemplates()
+
+        # writer -> scenario execs queued this loop iteration (one flush each)
+        self.scenarioOut    = {}
+
+    ###############################################################################
+    #
+    # Procedure   : _compileTemplates()
+    #
+    # Description : Pre-render every outbound message type - header CompIDs and
+    #             : static session values are rendered once per server, slots
+    #             : (None) are filled by BuildFromTemplate.
+    #
+    # Input       : -none-
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _compileTemplates(self):
+
+        compIds = {"49": self.senderCompID, "56": self.targetCompID}
+
+        # 37, 17, 11, 54, 38, 55, 40, 44, 60, 34
+        self.newOrderAckTmpl = CompileFixTemplate({
+            "35": "8", "150": "0", "39": "0",
+            "37": None, "17": None, "11": None, "54": None, "38": None,
+            "55": None, "40": None, "44": None, "60": None,
+            **compIds, "34": None,
+        })
+
+        # 37, 17, 11, 41, 54, 38, 55, 60, 34
+        self.cancelAckTmpl = CompileFixTemplate({
+            "35": "8", "150": "4", "39": "4",
+            "37": None, "17": None, "11": None, "41": None, "54": None,
+            "38": None, "55": None, "60": None,
+            **compIds, "34": None,
+        })
+
+        # 37, 17, 11, 41, 54, 38, 55, 40, 44, 60, 34
+        self.replaceAckTmpl = CompileFixTemplate({
+            "35": "8", "150": "5", "39": "5",
+            "37": None, "17": None, "11": None, "41": None, "54": None,
+            "38": None, "55": None, "40": None, "44": None, "60": None,
+            **compIds, "34": None,
+        })
+
+        # 45, 371, 373, 58, 34, 52
+        self.sessionRejectTmpl = CompileFixTemplate({
+            "35": "3", "45": None, "371": None, "373": None, "58": None,
+            **compIds, "34": None, "52": None,
+        })
+
+        # 11, [41,] 58, 34, 60
+        self.orderRejectTmpl = CompileFixTemplate({
+            "35": "8", "150": "8", "39": "8", "11": None, "58": None,
+            **compIds, "34": None, "60": None,
+        })
+
+        self.orderRejectOrigTmpl = CompileFixTemplate({
+            "35": "8", "150": "8", "39": "8", "11": None, "41": None, "58": None,
+            **compIds, "34": None, "60": None,
+        })
+
+        # 34, 52
+        self.heartbeatTmpl = CompileFixTemplate({"35": "0", "34": None, **compIds, "52": None})
+        self.logoutTmpl    = CompileFixTemplate({"35": "5", "34": None, **compIds, "52": None})
+
+        # 34, 52 - with the configured HeartBtInt
+        self.logonTmpl = CompileFixTemplate({
+            "35": "A", "34": None, **compIds, "52": None, "98": "0", "108": self.heartBtInt,
+        })
+
+        # 150, 39, 37, 17, 11, 55, 54, 38, 44, 60, 32, 31, 14, 151, 34
+        self.scenarioExecTmpl = CompileFixTemplate({
+            "35": "8", "150": None, "39": None, "37": None, "17": None, "11": None,
+            "55": None, "54": None, "38": None, "44": None, "60": None,
+            "32": None, "31": None, "14": None, "151": None,
+            **compIds, "34": None,
+        })
 
     #
     # core server
@@ -63,30 +217,46 @@ class FixEmulatorServer:
     # Procedure   : Start()
     #
     # Description : - Initialize listener socket.
-    #             : - Spawn handler threads for FIX client connections.
+    #             : - Serve every FIX client connection as a coroutine on the
+    #             :   running event loop (no thread per connection).
     #
     # Input       : -none-
     #
-    # Returns     : -none-
+    # Returns     : -none- (serves until cancelled)
     #
     ###############################################################################
 
-    def Start(self):
+    async def Start(self):
 
         logging.info(f"Starting FIX Emulator on {self.host}:{self.port}")
 
-        self.serverSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.serverSocket.bind((self.host, self.port))
-        self.serverSocket.listen(1)
+        self.server = await asyncio.start_server(
+            self._boundedClient, self.host, self.port,
+            backlog=1024,
+            reuse_port=self.reusePort or None
+        )
 
         logging.info("Waiting for incoming FIX connection...")
 
-        while True:
-            clientSocket, addr = self.serverSocket.accept()
-            print(f"[INFO] Connection established from {addr}")
-            logging.info(f"Connection established from {addr}")
-            thread = threading.Thread(target=self.HandleClient, args=(clientSocket,))
-            thread.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    #
+    # apply socket options, then hold a session slot for the life of the connection
+    #
+
+    async def _boundedClient(self, reader, writer):
+
+        if self.socketBuffer:
+            sock = writer.get_extra_info("socket")
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socketBuffer)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socketBuffer)
+
+        if self.sessionSlots.locked():
+            logging.warning(f"Session limit reached, queueing {writer.get_extra_info('peername')}")
+
+        async with self.sessionSlots:
+            await self.HandleClient(reader, writer)
 
     # 
     # scenario helpers
@@ -111,20 +281,130 @@ class FixEmulatorServer:
 
     ###############################################################################
     #
-    # Procedure   : _getOrder()
+    # Procedure   : _parseQty()
+    #
+    # Description : Parse a FIX quantity as an int lot count, falling back to
+    #             : float only for fractional quantities.
+    #
+    # Input       : qtyStr - string - OrderQty (38) value
+    #
+    # Returns     : int (float if fractional) - 0 if unparseable
+    #
+    ###############################################################################
+
+    def _parseQty(self, qtyStr):
+
+        # a fractional qty goes straight to float() - int() would only raise
+        try:
+            if "." not in qtyStr:
+                return int(qtyStr)
+
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            return float(qtyStr)
+
+        except (TypeError, ValueError):
+            return 0
+
+
+    ###############################################################################
     #
-    # Description : Return and increment outbound FIX sequnce number for scenario
-    #             : execs.
+    # Procedure   : _isPositiveDecimal()
+    #
+    # Description : Check a FIX Qty/Price string is a plain positive decimal
+    #             : (ASCII digits with at most one '.', not all zeros) using
+    #             : str methods only - no float() and no exception on a reject.
+    #
+    # Input       : value - string - field value (None if absent)
+    #
+    # Returns     : bool
+    #
+    ###############################################################################
+
+    def _isPositiveDecimal(self, value):
+
+        # isdecimal() alone also takes any Unicode digit ("١٠٠", fullwidth)
+        return bool(value) and value.isascii() and value.replace(".", "", 1).isdecimal() and bool(value.strip("0."))
+
+
+    ###############################################################################
+    #
+    # Procedure   : _firstMissingTag()
+    #
+    # Description : Return the first required tag that is absent or empty.
+    #             : - Stops at the first miss, nothing is allocated.
+    #
+    # Input       : fixFields    - dictionary - parsed inbound message
+    #             : requiredTags - dictionary - tag -> name, in check order
+    #
+    # Returns     : string - missing tag, or None if all are present
+    #
+    ###############################################################################
+
+    def _firstMissingTag(self, fixFields, requiredTags):
+
+        for tag in requiredTags:
+            if not fixFields.get(tag):
+                return tag
+
+        return None
+
+
+    ###############################################################################
+    #
+    # Procedure   : _nextOutboundSeq()
+    #
+    # Description : Return and increment a connection's outbound FIX sequence
+    #             : number (our Logon takes 1).
     # 
-    # Input       : clOrdId - client order identifier
+    # Input       : writer - StreamWriter for the FIX client
     # 
-    # Returns     : dictionary - order object or None if not found
+    # Returns     : int - next outbound sequence number
+    #
+    ###############################################################################
+
+    def _nextOutboundSeq(self, writer):
+        return self.sessionSeq[writer]()
+
+
+    ###############################################################################
+    #
+    # Procedure   : _replySeq()
+    #
+    # Description : Reply MsgSeqNum derived from an inbound message - fallback
+    #             : for the public Build*Response calls made without a session.
+    #
+    # Input       : fixFields - dictionary - parsed inbound message
+    #
+    # Returns     : string - inbound MsgSeqNum (34) + 1, "1" if missing/garbled
     #
     ###############################################################################
 
-    def _nextOutboundSeq(self):
-        self.outSeq += 1
-        return self.outSeq
+    def _replySeq(self, fixFields):
+
+        inSeq = fixFields.get("34", "0")
+
+        return str(int(inSeq) + 1) if inSeq.isdigit() else "1"
+
+
+    ###############################################################################
+    #
+    # Procedure   : _stampNow()
+    #
+    # Description : One clock read for a FIX timestamp plus the next unique id
+    #             : stamp (server start ms + counter).
+    #
+    # Input       : -none-
+    #
+    # Returns     : tuple - (FIX timestamp str, "<start ms><seq>" id str)
+    #
+    ###############################################################################
+
+    def _stampNow(self):
+
+        return FixTimestampNs(time.time_ns()), f"{self.idPrefix}{self.idSeq()}"
 
 
     ###############################################################################
@@ -143,9 +423,14 @@ class FixEmulatorServer:
 
     def _sendScenarioExec(self, order, action):
 
-        clientSocket = order.get("clientSocket")
-        if not clientSocket:
-            logging.warning(f"[SCENARIO] No client socket for order {order}")
+        # canceled/filled while the scenario was in flight - nothing more to report
+        if order["status"] in TERMINAL_STATUSES:
+            logging.info("[SCENARIO] action=%s dropped, order %s is %s", action, order["currentClOrdId"], order["status"])
+            return
+
+        writer = order.get("writer")
+        if not writer or writer.is_closing():
+            logging.warning(f"[SCENARIO] No client connection for order {order}")
             return
 
         clOrdId = order["currentClOrdId"]
@@ -155,30 +440,31 @@ class FixEmulatorServer:
         price   = order["price"]
         orderId = order["orderId"]
 
-        try:
-            origQty = float(qtyStr)
-
-        except Exception:
-            origQty = 0.0
-
-        cumQty    = float(order.get("cumQty", 0.0))
-        leavesQty = float(order.get("leavesQty", origQty))
+        # whole lots stay int end to end - no float drift or ".0" in 32/14/151
+        origQty   = self._parseQty(qtyStr)
+        cumQty    = order.get("cumQty", 0)
+        leavesQty = order.get("leavesQty", origQty)
 
         execType  = None
         ordStatus = None
-        lastQty   = 0.0
+        lastQty   = 0
 
         # 
         # scenario actions
         # 
 
         if action == "new":
-            logging.info(f"[SCENARIO] action=new for {clOrdId} (no extra ExecReport sent)")
+            logging.info("[SCENARIO] action=new for %s (no extra ExecReport sent)", clOrdId)
             return
 
         elif action == "partial":
             execType = "1"
-            fillQty = leavesQty * 0.25 if leavesQty > 0 else 0.0
+            if leavesQty <= 0:
+                fillQty = 0
+            elif isinstance(leavesQty, int):
+                fillQty = max(leavesQty // 4, 1)
+            else:
+                fillQty = leavesQty * 0.25
             lastQty = fillQty
             cumQty += fillQty
             leavesQty -= fillQty
@@ -188,24 +474,24 @@ class FixEmulatorServer:
             execType  = "2"
             lastQty   = leavesQty if leavesQty > 0 else origQty
             cumQty    = origQty
-            leavesQty = 0.0
+            leavesQty = 0
             ordStatus = "2"
 
         elif action == "cancel":
             execType  = "4"
             ordStatus = "4"
-            lastQty   = 0.0
+            lastQty   = 0
 
         elif action == "reject":
             execType  = "8"
             ordStatus = "8"
-            lastQty   = 0.0
+            lastQty   = 0
 
         elif action == "replace_ack":
             execType  = "5" 
             ordStatus = "5"
-            lastQty   = 0.0
-            logging.info(f"[SCENARIO] Replace ACK for {clOrdId}")
+            lastQty   = 0
+            logging.info("[SCENARIO] Replace ACK for %s", clOrdId)
 
         else:
             logging.warning(f"[SCENARIO] Unsupported action '{action}'")
@@ -222,35 +508,102 @@ class FixEmulatorServer:
             "8": "REJECTED",
         }.get(ordStatus, order.get("status", "NEW"))
 
-        now    = datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3]
-        execId = f"EX{int(datetime.utcnow().timestamp() * 1000)}"
-
-        fields = {
-            "35":  "8",
-            "150": execType,
-            "39":  ordStatus,
-            "37":  orderId,
-            "17":  execId,
-            "11":  clOrdId,
-            "55":  symbol,
-            "54":  side,
-            "38":  qtyStr,
-            "44":  price,
-            "60":  now,
-            "32":  str(lastQty),
-            "31":  price,
-            "14":  str(cumQty),
-            "151": str(leavesQty),
-            "49":  self.senderCompID,
-            "56":  self.targetCompID,
-            "34":  self._nextOutboundSeq(),  # you already have this method
+        # one clock read for SendingTime and the exec id
+        now, idStamp = self._stampNow()
+        execId = "EX" + idStamp
+
+        response = BuildFromTemplate(self.scenarioExecTmpl, (
+            execType, ordStatus, orderId, execId, clOrdId, symbol, side, qtyStr, price, now,
+            lastQty, price, cumQty, leavesQty, self._nextOutboundSeq(writer)
+        ))
+
+        # scenarios run on the same loop. execs whose delays expire together
+        # share one writelines() per connection instead of a send() each
+        pending  = self.scenarioOut.get(writer)
+
+        if pending is None:
+            pending = self.scenarioOut[writer] = []
+            asyncio.get_running_loop().call_soon(self._flushScenarioOut, writer)
+
+        pending.append(response)
+
+        logging.info("---- Scenario ExecReport (%s) ----", action)
+
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info("< " + response.decode().replace(SOH, "|"))
+
+
+    #
+    # write every scenario exec queued for this connection in one go
+    #
+
+    def _flushScenarioOut(self, writer):
+
+        pending = self.scenarioOut.pop(writer, None)
+
+        if pending and not writer.is_closing():
+            writer.writelines(pending)
+
+
+    ###############################################################################
+    #
+    # Procedure   : _startScenario()
+    #
+    # Description : Pick the behavior for an order's symbol and schedule it on
+    #             : the scenario engine.
+    #
+    # Input       : order   - dictionary - stored order state
+    #             : clOrdId - string     - ClOrdID the scenario reports under
+    #             : tag     - string     - log prefix, e.g. "(REPLACE) "
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _startScenario(self, order, clOrdId, tag):
+
+        symbol = order["symbol"]
+
+        orderObj = {
+            "clOrdID": clOrdId,
+            "symbol" : symbol,
+            "side"   : order["side"],
+            "qty"    : order["qty"],
+            "price"  : order["price"],
+            "server" : self,
         }
 
-        response = BuildFixMessage(fields)
-        clientSocket.sendall(response.encode())
+        # choose behavior
+        execution      = self.sessionConfig["execution"]
+        chosenBehavior = execution["lookupFn"](symbol) or execution["defaultBehavior"]
+
+        logging.info("[SCENARIO] %sSymbol=%s → Behavior=%s", tag, symbol, chosenBehavior)
+
+        # runs as a task on this loop, this connection goes back to reading.
+        # the future is kept so a cancel/replace/disconnect can stop it
+        order["scenarioObj"] = orderObj
+        order["scenario"]    = self.scenarioEngine.schedule(orderObj, chosenBehavior)
+
+
+    ###############################################################################
+    #
+    # Procedure   : _stopScenario()
+    #
+    # Description : Cancel an order's in-flight scenario, if any.
+    #
+    # Input       : order - dictionary - stored order state
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _stopScenario(self, order):
+
+        future = order.pop("scenario", None)
 
-        logging.info(f"---- Scenario ExecReport ({action}) ----")
-        logging.info("< " + response.replace(SOH, "|"))
+        if future is not None and not future.done():
+            logging.info("[SCENARIO] Stopping scenario for %s", order["currentClOrdId"])
+            future.cancel()
 
 
     ###############################################################################
@@ -281,10 +634,86 @@ class FixEmulatorServer:
             logging.warning(f"[SCENARIO] No stored order for ClOrdID={clOrdId}")
             return
 
-        logging.info(f"[SCENARIO] HandleScenarioAction: clOrdID={clOrdId}, action={action}")
+        logging.info("[SCENARIO] HandleScenarioAction: clOrdID=%s, action=%s", clOrdId, action)
         self._sendScenarioExec(order, action)
 
 
+    #
+    # rejects
+    #
+
+
+    ###############################################################################
+    #
+    # Procedure   : _sendReject()
+    #
+    # Description : Build and queue a session-level Reject (35=3).
+    #
+    # Input       : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : refTag     - string     - RefTagID (371)
+    #             : reason     - string     - SessionRejectReason (373)
+    #             : text       - string     - Text (58)
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _sendReject(self, pendingOut, fixFields, nextSeq, refTag, reason, text):
+
+        self._sendResponse(pendingOut, BuildFromTemplate(self.sessionRejectTmpl, (
+            fixFields.get("34", "0"), refTag, reason, text, nextSeq, FixTimestamp()
+        )))
+
+
+    ###############################################################################
+    #
+    # Procedure   : _sendOrderReject()
+    #
+    # Description : Build and queue a rejecting ExecutionReport (35=8, 150=8).
+    #
+    # Input       : pendingOut  - list       - responses queued for this recv batch
+    #             : nextSeq     - int        - outbound MsgSeqNum for the reply
+    #             : clOrdId     - string     - ClOrdID (11)
+    #             : origClOrdId - string     - OrigClOrdID (41), None to omit
+    #             : text        - string     - Text (58)
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _sendOrderReject(self, pendingOut, nextSeq, clOrdId, origClOrdId, text):
+
+        if origClOrdId is None:
+            response = BuildFromTemplate(self.orderRejectTmpl, (clOrdId, text, nextSeq, FixTimestamp()))
+        else:
+            response = BuildFromTemplate(self.orderRejectOrigTmpl, (clOrdId, origClOrdId, text, nextSeq, FixTimestamp()))
+
+        self._sendResponse(pendingOut, response)
+
+
+    ###############################################################################
+    #
+    # Procedure   : _sendResponse()
+    #
+    # Description : Queue and log an encoded outbound message.
+    #
+    # Input       : pendingOut - list  - responses queued for this recv batch
+    #             : response   - bytes - encoded FIX message
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _sendResponse(self, pendingOut, response):
+
+        pendingOut.append(response)
+
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+
     # 
     # client loop
     #
@@ -300,707 +729,647 @@ class FixEmulatorServer:
     #             : - Message validation and business logic.
     #             : - Sends response.
     #
-    # Input       : clientSocket - TCP socket connected to the FIX client
+    # Input       : reader - asyncio.StreamReader for the FIX client
+    #             : writer - asyncio.StreamWriter for the FIX client
     #
     # Returns     : -none- (runs until client disconnects or Logout)
     #
     ###############################################################################
 
-    def HandleClient(self, clientSocket):
+    async def HandleClient(self, reader, writer):
 
-        buffer = ""
+        # the console StreamHandler already echoes this - no separate print()
+        addr = writer.get_extra_info("peername")
+        logging.info("Connection established from %s", addr)
 
-        while True:
+        # bytes in, appended in place - no full-buffer copy per recv
+        buffer = bytearray()
 
-            data = clientSocket.recv(4096)
+        # where the trailer scan resumes once more of a partial message arrives
+        scanFrom = 0
 
-            if not data:
-                break
+        # responses for the current recv batch, written together
+        pendingOut = []
+        closing    = False
 
-            buffer += data.decode("utf-8")
+        # this session's outbound MsgSeqNum - our Logon reply takes 1
+        self.sessionSeq[writer] = itertools.count(1).__next__
 
-            # crude message seperator
-            while SOH in buffer:
+        try:
 
-                message, sep, buffer = buffer.partition(SOH * 2) 
-                fixFields = ParseFixMessage(message + SOH)
+            while not closing:
 
-                if not fixFields:
-                    continue
+                # take everything the stream has buffered (its 64 KiB limit) in
+                # one await - a burst is then framed and answered as one batch
+                data = await reader.read(65536)
 
-                msgType = fixFields.get("35")
+                if not data:
+                    break
 
-                if msgType == "A":
+                buffer += data
 
-                    logging.info("--- Login request ---")
-                    logging.info("> " + message.replace(SOH, '|'))
+                # message stays bytes - the parser decodes it once, logging on demand
+                while True:
 
-                    response = self.BuildLogonResponse(fixFields)
-                    clientSocket.sendall(response.encode("utf-8"))
+                    message = self._frameOne(buffer, scanFrom)
 
-                    logging.info("--- Login response ---")
-                    logging.info("< " + response.replace(SOH, '|'))
+                    # partial message - a trailer still to come starts at or
+                    # after the last SOH, bytes before it are not rescanned
+                    if message is None:
+                        scanFrom = max(buffer.rfind(SOH_B), 0)
+                        break
 
-                elif msgType == "0":
+                    scanFrom = 0
 
-                    logging.info("--- Heartbeat ---")
-                    logging.info("> " + message.replace(SOH, '|'))
+                    # True - Logout, stop once this batch's responses are out
+                    if self._dispatch(writer, pendingOut, message):
+                        closing = True
+                        break
 
-                    response = self.BuildHeartbeatResponse(fixFields)
-                    clientSocket.sendall(response.encode("utf-8"))
+                # one write + drain per recv batch instead of per response.
+                # scenario execs still queued hold lower seqs, they go first
+                if pendingOut:
+                    self._flushScenarioOut(writer)
+                    writer.writelines(pendingOut)
+                    pendingOut.clear()
+                    await writer.drain()
 
-                    logging.info("--- Heartbeat ---")
-                    logging.info("< " + response.replace(SOH, '|'))
+        finally:
+            # scenario execs check is_closing() before taking a seq
+            del self.sessionSeq[writer]
 
-                elif msgType == "5":
+            # nobody left to report to - don't keep this session's scenarios alive
+            for order in self.orders.values():
+                if order.get("writer") is writer:
+                    self._stopScenario(order)
+            writer.close()
+            await writer.wait_closed()
 
-                    logging.info("--- Logout request ---")
-                    logging.info("> " + message.replace(SOH, '|'))
+        if closing:
+            logging.info("--- Connection closed by logout ---")
+        else:
+            logging.info("--- Connection closed ---")
 
-                    response = self.BuildLogoutResponse(fixFields)
-                    clientSocket.sendall(response.encode("utf-8"))
+    ###############################################################################
+    #
+    # Procedure   : _frameOne()
+    #
+    # Description : Cut the next complete FIX message off the receive buffer.
+    #             : - BodyLength (9) locates the 10=xxx trailer directly.
+    #             : - Falls back to scanning for <SOH>10= when 9 is missing
+    #             :   or wrong (tag 10 only ever appears as the trailer).
+    #             : - Bytes before 8=FIX (stray SOHs, line noise) are dropped.
+    #
+    # Input       : buffer   - bytearray - receive buffer, consumed in place
+    #             : scanFrom - buffer offset the trailer scan resumes from
+    #
+    # Returns     : bytes - one message up to and including its trailer SOH,
+    #             :         None if no complete message is buffered yet
+    #
+    ###############################################################################
 
-                    logging.info("--- Logout response ---")
-                    logging.info("< " + response.replace(SOH, '|'))
+    def _frameOne(self, buffer, scanFrom=0):
 
-                    clientSocket.close()
-                    logging.info("--- Connection closed by logout ---")
-                    return
+        start = buffer.find(BEGIN_STRING)
 
-                #
-                # New Order Single (Tag 35=D)
-                #
+        if start > 0:
+            del buffer[:start]
+            scanFrom = max(scanFrom - start, 0)
 
-                elif msgType == "D":
+        if start >= 0:
 
-                    logging.info("---- New Order Single (35=D) ----")
-                    logging.info("> " + message.replace(SOH, '|'))
+            lenAt  = buffer.find(b"\x019=", 0, 32)
+            lenEnd = buffer.find(SOH_B, lenAt + 3, lenAt + 16) if lenAt >= 0 else -1
 
-                    clOrdId = fixFields.get("11")
-                    side    = fixFields.get("54")
-                    qty     = fixFields.get("38")
-                    symbol  = fixFields.get("55")
-                    ordType = fixFields.get("40")
-                    price   = fixFields.get("44", "0")
+            if lenEnd >= 0 and buffer[lenAt + 3:lenEnd].isdigit():
 
-                    # validation - session level
+                end = lenEnd + 1 + int(buffer[lenAt + 3:lenEnd])
 
-                    requiredTags = {
-                        "11": "ClOrdID",
-                        "54": "Side",
-                        "38": "OrderQty",
-                        "55": "Symbol",
-                        "40": "OrdType",
-                    }
+                if buffer[end:end + 3] == b"10=" and buffer[end + 6:end + 7] == SOH_B:
+                    message = bytes(buffer[:end + 7])
+                    del buffer[:end + 7]
+                    return message
 
-                    missingTags = [tag for tag in requiredTags if not fixFields.get(tag)]
+        trailer = buffer.find(b"\x0110=", scanFrom)
 
-                    if missingTags:
+        if trailer < 0:
+            return None
 
-                        missing = missingTags[0]
-                        logging.info(f"---- Order Reject (missing tag {missing} {requiredTags[missing]}) ----")
+        stop = buffer.find(SOH_B, trailer + 4)
 
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": missing,
-                            "373": "1",
-                            "58" : f"Required tag {missing} ({requiredTags[missing]}) missing in NewOrderSingle",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
+        if stop < 0:
+            return None
 
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
+        message = bytes(buffer[:stop + 1])
+        del buffer[:stop + 1]
 
-                    # validation - session level invalid values
+        return message
 
-                    try:
 
-                        qtyVal = float(qty)
+    ###############################################################################
+    #
+    # Procedure   : _dispatch()
+    #
+    # Description : Parse one framed message and run its MsgType handler.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list  - responses queued for this recv batch
+    #             : message    - bytes - one framed inbound message
+    #
+    # Returns     : True - close the connection once the batch is sent
+    #
+    ###############################################################################
+
+    def _dispatch(self, writer, pendingOut, message):
+
+        fixFields = ParseFixMessage(message)
+
+        if not fixFields:
+            return False
+
+        # the "> "/"< " traffic lines are built only when INFO is on
+        logTraffic = logging.root.isEnabledFor(logging.INFO)
+
+        msgType = fixFields.get("35")
+        handler = self.handlers.get(msgType)
+
+        if handler:
+            # every handler path sends exactly one reply, which takes this seq
+            return handler(writer, pendingOut, fixFields, self._nextOutboundSeq(writer), message, logTraffic)
+
+        logging.info("--- Unsupported MsgType %s ---", msgType)
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        return False
+
+    #
+    # message handlers (dispatched by MsgType from _dispatch)
+    #
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleLogon()
+    #
+    # Description : Logon (35=A) - reply with our Logon.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _handleLogon(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("--- Login request ---")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        response = self.BuildLogonResponse(fixFields, nextSeq)
+        pendingOut.append(response)
+
+        logging.info("--- Login response ---")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleHeartbeat()
+    #
+    # Description : Heartbeat (35=0) - reply with a Heartbeat.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _handleHeartbeat(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("--- Heartbeat received ---")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        response = self.BuildHeartbeatResponse(fixFields, nextSeq)
+        pendingOut.append(response)
+
+        logging.info("--- Heartbeat response ---")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleLogout()
+    #
+    # Description : Logout (35=5) - reply with Logout and close the connection.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : True - close the connection once the batch is sent
+    #
+    ###############################################################################
+
+    def _handleLogout(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("--- Logout request ---")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        response = self.BuildLogoutResponse(fixFields, nextSeq)
+        pendingOut.append(response)
+
+        logging.info("--- Logout response ---")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+        # HandleClient flushes the Logout and closes the connection
+        return True
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleNewOrder()
+    #
+    # Description : New Order Single (35=D) - validate, store, ack and
+    #             : hand the order to the scenario engine.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _handleNewOrder(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("---- New Order Single (35=D) ----")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        clOrdId = fixFields.get("11")
+        side    = fixFields.get("54")
+        qty     = fixFields.get("38")
+        symbol  = fixFields.get("55")
+        ordType = fixFields.get("40")
+        price   = fixFields.get("44", "0")
+
+        # validation - session level
+
+        requiredTags = NEW_ORDER_REQUIRED
+        missing      = self._firstMissingTag(fixFields, requiredTags)
+
+        if missing:
+
+            logging.info("---- Order Reject (missing tag %s %s) ----", missing, requiredTags[missing])
+
+            self._sendReject(pendingOut, fixFields, nextSeq, missing, "1", f"Required tag {missing} ({requiredTags[missing]}) missing in NewOrderSingle")
+            return
+
+        # validation - session level invalid values
+
+        # same plain-decimal rule as Replace (no nan/inf/1e2), so D and G
+        # accept the same quantities
+
+        if not self._isPositiveDecimal(qty):
+
+            logging.info("---- Order Reject (invalid OrderQty) ----")
+
+            self._sendReject(pendingOut, fixFields, nextSeq, "38", "5", "OrderQty must be a positive number")
+            return
+
+        # parsed once here and stored as leavesQty below
+        qtyVal = self._parseQty(qty)
+
+        # validation - invalid order type
+
+        if ordType not in VALID_ORD_TYPES:
+            logging.info("---- Order Reject (unsupported OrdType %s) ----", ordType)
+
+            self._sendReject(pendingOut, fixFields, nextSeq, "40", "2", f"Unsupported OrdType {ordType}")
+            return
+
+        # validation - invalid price
+
+        if ordType == "2" and not self._isPositiveDecimal(price):
+
+            logging.info("---- Order Reject (invalid Price) ----")
+
+            self._sendReject(pendingOut, fixFields, nextSeq, "44", "5", "Price must be positive for Limit orders")
+            return
+
+        # accept and store order
+
+        # one clock read for TransactTime and both ids
+        now, idStamp = self._stampNow()
+        execId  = "EX" + idStamp
+        orderId = "OR" + idStamp
+
+        newOrder = {
+            "orderId"  : orderId,
+            "execId"   : execId,
+            "symbol"   : symbol,
+            "side"     : side,
+            "qty"      : qty,
+            "price"    : price,
+            "ordType"  : ordType,
+            "status"   : "NEW",
+            "timestamp": now,
+
+            # track ids / history
+            "clOrdID"       : clOrdId,
+            "currentClOrdId": clOrdId,
+            "lastClOrdId"   : clOrdId,
+            "history"       : deque((clOrdId,), maxlen=ORDER_HISTORY),
+
+            # stream needed for scenario-generated execs
+            "writer": writer,
+
+            # execution progress tracking
+            "cumQty"   : 0,
+            "leavesQty": qtyVal,
+        }
+
+        # validation - application level (duplicate check and insert
+        # in one lookup, an existing order is left untouched)
 
-                        if qtyVal <= 0:
-                            raise ValueError()
+        if self.orders.setdefault(clOrdId, newOrder) is not newOrder:
 
-                    except Exception:
+            logging.info("---- Order Reject (duplicate ClOrdID %s) ----", clOrdId)
 
-                        logging.info("---- Order Reject (invalid OrderQty) ----")
+            self._sendOrderReject(pendingOut, nextSeq, clOrdId, None, "Duplicate ClOrdID — order already exists")
+            return
+
+        # immutable fields only - a buffered record formats late, and the live
+        # order dict (and its writer) must not be captured by it
+        logging.info("[ORDER STORED] %s → orderId=%s symbol=%s side=%s qty=%s price=%s ordType=%s status=%s",
+                     clOrdId, orderId, symbol, side, qty, price, ordType, newOrder["status"])
+
+        # send ack
+
+        response = BuildFromTemplate(self.newOrderAckTmpl, (
+            orderId, execId, clOrdId, side, qty, symbol, ordType, price, now, nextSeq
+        ))
+        pendingOut.append(response)
+
+        logging.info("---- Order Accepted (NEW) ----")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+        #
+        # scenario engine
+        #
+
+        if self.scenarioEngine and self.sessionConfig:
+            self._startScenario(newOrder, clOrdId, "")
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleCancel()
+    #
+    # Description : Order Cancel Request (35=F) - validate and ack the cancel.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _handleCancel(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("---- Order Cancel Request (35=F) ----")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
+
+        origClOrdId = fixFields.get("41")
+        newClOrdId  = fixFields.get("11")
+        symbol      = fixFields.get("55")
+        side        = fixFields.get("54")
+
+        # validation - session level
+
+        requiredTags = CANCEL_REQUIRED
+        missing      = self._firstMissingTag(fixFields, requiredTags)
+
+        if missing:
+            logging.info("---- Cancel Reject (missing tag %s %s) ----", missing, requiredTags[missing])
+
+            self._sendReject(pendingOut, fixFields, nextSeq, missing, "1", f"Required tag {missing} ({requiredTags[missing]}) missing in CancelRequest")
+            return
+
+        # validation - order id reuse
+
+        if newClOrdId in self.orders:
+            logging.info("---- Cancel Reject (duplicate ClOrdID %s) ----", newClOrdId)
+
+            self._sendOrderReject(pendingOut, nextSeq, newClOrdId, origClOrdId, "Duplicate ClOrdID on Cancel Request")
+            return
+
+        # validation - order lookup ... does it exist
+
+        order = self.orders.get(origClOrdId)
+
+        if not order:
+            logging.info("---- Cancel Reject (unknown order %s) ----", origClOrdId)
+
+            self._sendOrderReject(pendingOut, nextSeq, newClOrdId, origClOrdId, "Unknown order / unable to cancel")
+            return
+
+        # validation - already canceled
+
+        if order["status"] == "CANCELED":
+            logging.info("---- Cancel Reject (order already canceled %s) ----", origClOrdId)
+
+            self._sendOrderReject(pendingOut, nextSeq, newClOrdId, origClOrdId, "Order already canceled")
+            return
+
+        # update order state
+
+        order["status"]         = "CANCELED"
+        order["lastClOrdId"]    = newClOrdId
+        order["currentClOrdId"] = newClOrdId
+        order["history"].append(newClOrdId)
+
+        # no fills after the cancel
+        self._stopScenario(order)
+
+        # send cancel ack
+
+        now, idStamp = self._stampNow()
+        execId  = "EX" + idStamp
+        orderId = order["orderId"]
+
+        response = BuildFromTemplate(self.cancelAckTmpl, (
+            orderId, execId, newClOrdId, origClOrdId, order["side"], order["qty"], order["symbol"], now, nextSeq
+        ))
+        pendingOut.append(response)
+
+        logging.info("---- Order Cancelled ----")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+
+    ###############################################################################
+    #
+    # Procedure   : _handleReplace()
+    #
+    # Description : Order Cancel/Replace Request (35=G) - validate, re-key
+    #             : the order, ack and signal/start its scenario.
+    #
+    # Input       : writer     - StreamWriter for the FIX client
+    #             : pendingOut - list       - responses queued for this recv batch
+    #             : fixFields  - dictionary - parsed inbound message
+    #             : nextSeq    - int        - outbound MsgSeqNum for the reply
+    #             : message    - bytes      - raw inbound message (for logging)
+    #             : logTraffic - bool       - log the "> "/"< " lines
+    #
+    # Returns     : -none-
+    #
+    ###############################################################################
+
+    def _handleReplace(self, writer, pendingOut, fixFields, nextSeq, message, logTraffic):
+
+        logging.info("---- Order Replace Request (35=G) ----")
+        if logTraffic:
+            logging.info("> " + message.decode("ascii", "replace").replace(SOH, '|'))
 
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": "38",
-                            "373": "5", 
-                            "58" : "OrderQty must be a positive number",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - invalid order type
-
-                    validOrdTypes = {"1", "2"} 
-
-                    if ordType not in validOrdTypes:
-                        logging.info(f"---- Order Reject (unsupported OrdType {ordType}) ----")
-
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": "40",
-                            "373": "2",
-                            "58" : f"Unsupported OrdType {ordType}",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - invalid price
-
-                    if ordType == "2": 
-
-                        try:
-                            priceVal = float(price)
-
-                            if priceVal <= 0:
-                                raise ValueError()
-
-                        except Exception:
-                            logging.info("---- Order Reject (invalid Price) ----")
-
-                            rejectFields = {
-                                "35" : "3",
-                                "45" : fixFields.get("34", "0"),
-                                "371": "44",
-                                "373": "5",
-                                "58" : "Price must be positive for Limit orders",
-                                "49" : self.senderCompID,
-                                "56" : self.targetCompID,
-                                "34" : str(int(fixFields.get('34', '0')) + 1),
-                                "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                            }
-
-                            response = BuildFixMessage(rejectFields)
-                            clientSocket.sendall(response.encode())
-                            logging.info("< " + response.replace(SOH, '|'))
-                            continue
-
-                    # validation - application level
-
-                    if clOrdId in self.orders:
-
-                        logging.info(f"---- Order Reject (duplicate ClOrdID {clOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : clOrdId,
-                            "58" : "Duplicate ClOrdID — order already exists",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # accept and store order
-
-                    now     = datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3]
-                    execId  = f"EX{int(datetime.utcnow().timestamp() * 1000)}"
-                    orderId = f"OR{int(datetime.utcnow().timestamp() * 1000)}"
-
-                    self.orders[clOrdId] = {
-                        "orderId"  : orderId,
-                        "execId"   : execId,
-                        "symbol"   : symbol,
-                        "side"     : side,
-                        "qty"      : qty,
-                        "price"    : price,
-                        "ordType"  : ordType,
-                        "status"   : "NEW",
-                        "timestamp": now,
-
-                        # track ids / history
-                        "clOrdID"       : clOrdId,
-                        "currentClOrdId": clOrdId,
-                        "lastClOrdId"   : clOrdId,
-                        "history"       : [clOrdId],
-
-                        # socket needed for scenario-generated execs
-                        "clientSocket": clientSocket,
-
-                        # execution progress tracking
-                        "cumQty"   : 0.0,
-                        "leavesQty": float(qty) if qty else 0.0,
-                    }
-
-                    logging.info(f"[ORDER STORED] {clOrdId} → {self.orders[clOrdId]}")
-
-                    # send ack
-
-                    ackFields = {
-                        "35" : "8",
-                        "150": "0",
-                        "39" :  "0",
-                        "37" :  orderId,
-                        "17" :  execId,
-                        "11" :  clOrdId,
-                        "54" :  side,
-                        "38" :  qty,
-                        "55" :  symbol,
-                        "40" :  ordType,
-                        "44" :  price,
-                        "60" :  now,
-                        "49" :  self.senderCompID,
-                        "56" :  self.targetCompID,
-                        "34" :  str(int(fixFields.get("34", "0")) + 1)
-                    }
-
-                    response = BuildFixMessage(ackFields)
-                    clientSocket.sendall(response.encode())
-
-                    logging.info("---- Order Accepted (NEW) ----")
-                    logging.info("< " + response.replace(SOH, '|'))
-
-                    #
-                    # scenario engine
-                    #
-
-                    if self.scenarioEngine and self.sessionConfig:
-
-                        orderObj = {
-                            "clOrdID": clOrdId,
-                            "symbol" : symbol,
-                            "side"   : side,
-                            "qty"    : qty,
-                            "price"  : price,
-                            "server" : self,
-                        }
-
-                        # choose behavior
-                        chosenBehavior = self.sessionConfig["execution"]["defaultBehavior"]
-
-                        for rule in self.sessionConfig["execution"]["rules"]:
-                            if rule["matchFn"](symbol):
-                                chosenBehavior = rule["behavior"]
-                                break
-
-                        logging.info(f"[SCENARIO] Symbol={symbol} → Behavior={chosenBehavior}")
-
-                        self.scenarioEngine.runBehavior(orderObj, chosenBehavior)
-
-                #
-                # Order Cancel Request (Tag 35=F)
-                #
-
-                elif msgType == "F":
-
-                    logging.info("---- Order Cancel Request (35=F) ----")
-                    logging.info("> " + message.replace(SOH, '|'))
-
-                    origClOrdId = fixFields.get("41")
-                    newClOrdId  = fixFields.get("11")
-                    symbol      = fixFields.get("55")
-                    side        = fixFields.get("54")
-
-                    # validation - session level
-
-                    requiredTags = {
-                        "11": "ClOrdID",
-                        "41": "OrigClOrdID",
-                        "55": "Symbol",
-                        "54": "Side",
-                    }
-
-                    missingTags = [tag for tag in requiredTags if not fixFields.get(tag)]
-
-                    if missingTags:
-                        missing = missingTags[0]
-                        logging.info(f"---- Cancel Reject (missing tag {missing} {requiredTags[missing]}) ----")
-
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": missing,
-                            "373": "1",
-                            "58" : f"Required tag {missing} ({requiredTags[missing]}) missing in CancelRequest",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get("34", "0")) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - order id reuse
-
-                    if newClOrdId in self.orders:
-                        logging.info(f"---- Cancel Reject (duplicate ClOrdID {newClOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : newClOrdId,
-                            "41" : origClOrdId,
-                            "58" : "Duplicate ClOrdID on Cancel Request",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - order lookup ... does it exist
-
-                    order = self.orders.get(origClOrdId)
-
-                    if not order:
-                        logging.info(f"---- Cancel Reject (unknown order {origClOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : newClOrdId,
-                            "41" : origClOrdId,
-                            "58" : "Unknown order / unable to cancel",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get("34", "0")) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - already canceled
-
-                    if order["status"] == "CANCELED":
-                        logging.info(f"---- Cancel Reject (order already canceled {origClOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : newClOrdId,
-                            "41" : origClOrdId,
-                            "58" : "Order already canceled",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # update order state
-
-                    order["status"]         = "CANCELED"
-                    order["lastClOrdId"]    = newClOrdId
-                    order["currentClOrdId"] = newClOrdId
-                    order["history"].append(newClOrdId)
-
-                    # send cancel ack
-
-                    now     = datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3]
-                    execId  = f"EX{int(datetime.utcnow().timestamp() * 1000)}"
-                    orderId = order["orderId"]
-
-                    ackFields = {
-                        "35" : "8",
-                        "150": "4",
-                        "39" : "4",
-                        "37" : orderId,
-                        "17" : execId,
-                        "11" : newClOrdId,
-                        "41" : origClOrdId,
-                        "54" : order["side"],
-                        "38" : order["qty"],
-                        "55" : order["symbol"],
-                        "60" : now,
-                        "49" : self.senderCompID,
-                        "56" : self.targetCompID,
-                        "34" : str(int(fixFields.get("34", "0")) + 1),
-                    }
-
-                    response = BuildFixMessage(ackFields)
-                    clientSocket.sendall(response.encode())
-
-                    logging.info("---- Order Cancelled ----")
-                    logging.info("< " + response.replace(SOH, '|'))
-
-                #
-                # Order Cancel/Replace Request (Tag 35=G)
-                #
-
-                elif msgType == "G":
-
-                    logging.info("---- Order Replace Request (35=G) ----")
-                    logging.info("> " + message.replace(SOH, '|'))
-
-                    origClOrdId = fixFields.get("41")
-                    newClOrdId  = fixFields.get("11")
-                    symbol      = fixFields.get("55")
-                    side        = fixFields.get("54")
-                    qty         = fixFields.get("38")
-                    ordType     = fixFields.get("40")
-                    price       = fixFields.get("44")
-
-                    #
-                    # validation — required tags
-                    #
-
-                    requiredTags = {
-                        "11": "ClOrdID",
-                        "41": "OrigClOrdID",
-                        "55": "Symbol",
-                        "54": "Side",
-                        "38": "OrderQty",
-                        "40": "OrdType",
-                    }
-
-                    missingTags = [tag for tag in requiredTags if not fixFields.get(tag)]
-
-                    if missingTags:
-                        missing = missingTags[0]
-
-                        logging.info(f"---- Replace Reject (missing tag {missing} {requiredTags[missing]}) ----")
-
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": missing,
-                            "373": "1",
-                            "58" : f"Required tag {missing} ({requiredTags[missing]}) missing in ReplaceRequest",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation — ClOrdID reuse
-
-                    if newClOrdId in self.orders:
-                        logging.info(f"---- Replace Reject (duplicate ClOrdID {newClOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : newClOrdId,
-                            "41" : origClOrdId,
-                            "58" : "Duplicate ClOrdID on Replace Request",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation - lookup using OLD ClOrdID (origClOrdId)
-
-                    order = self.orders.get(origClOrdId)
-
-                    if not order:
-
-                        logging.info(f"---- Replace Reject (unknown order {origClOrdId}) ----")
-
-                        rejectFields = {
-                            "35" : "8",
-                            "150": "8",
-                            "39" : "8",
-                            "11" : newClOrdId,
-                            "41" : origClOrdId,
-                            "58" : "Unknown order / unable to replace",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "60" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation — invalid qty
-
-                    try:
-
-                        if float(qty) <= 0:
-                            raise ValueError()
-
-                    except Exception:
-                        logging.info("---- Replace Reject (invalid OrderQty) ----")
-
-                        rejectFields = {
-                            "35" : "3",
-                            "45" : fixFields.get("34", "0"),
-                            "371": "38",
-                            "373": "5",
-                            "58" : "OrderQty must be a positive number for Replace request",
-                            "49" : self.senderCompID,
-                            "56" : self.targetCompID,
-                            "34" : str(int(fixFields.get('34', '0')) + 1),
-                            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                        }
-
-                        response = BuildFixMessage(rejectFields)
-                        clientSocket.sendall(response.encode())
-                        logging.info("< " + response.replace(SOH, '|'))
-                        continue
-
-                    # validation — invalid price for Limit
-
-                    if ordType == "2":
-
-                        try:
-                            if float(price) <= 0:
-                                raise ValueError()
-
-                        except Exception:
-
-                            logging.info("---- Replace Reject (invalid Price) ----")
-
-                            rejectFields = {
-                                "35" : "3",
-                                "45" : fixFields.get("34", "0"),
-                                "371": "44",
-                                "373": "5",
-                                "58" : "Price must be positive for Limit Replace",
-                                "49" : self.senderCompID,
-                                "56" : self.targetCompID,
-                                "34" : str(int(fixFields.get('34', '0')) + 1),
-                                "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-                            }
-
-                            response = BuildFixMessage(rejectFields)
-                            clientSocket.sendall(response.encode())
-                            logging.info("< " + response.replace(SOH, '|'))
-                            continue
-
-                    # apply the replace values
-
-                    oldKey = origClOrdId
-
-                    order["qty"]     = qty
-                    order["price"]   = price
-                    order["ordType"] = ordType
-                    order["side"]    = side
-                    order["symbol"]  = symbol
-
-                    order["currentClOrdId"] = newClOrdId
-                    order["lastClOrdId"]    = newClOrdId
-                    order["history"].append(newClOrdId)
-
-                    # update dictionary
+        origClOrdId = fixFields.get("41")
+        newClOrdId  = fixFields.get("11")
+        symbol      = fixFields.get("55")
+        side        = fixFields.get("54")
+        qty         = fixFields.get("38")
+        ordType     = fixFields.get("40")
+        price       = fixFields.get("44")
 
-                    self.orders.pop(oldKey)
-                    self.orders[newClOrdId] = order
+        #
+        # validation — required tags
+        #
 
-                    # ack - send the ack message
-
-                    now     = datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3]
-                    execId  = f"EX{int(datetime.utcnow().timestamp() * 1000)}"
-                    orderId = order["orderId"]
-
-                    ackFields = {
-                        "35" : "8",
-                        "150": "5",
-                        "39" : "5",
-                        "37" : orderId,
-                        "17" : execId,
-                        "11" : newClOrdId,
-                        "41" : origClOrdId,
-                        "54" : side,
-                        "38" : qty,
-                        "55" : symbol,
-                        "40" : ordType,
-                        "44" : price,
-                        "60" : now,
-                        "49" : self.senderCompID,
-                        "56" : self.targetCompID,
-                        "34" : str(int(fixFields.get("34", "0")) + 1),
-                    }
+        requiredTags = REPLACE_REQUIRED
+        missing      = self._firstMissingTag(fixFields, requiredTags)
 
-                    response = BuildFixMessage(ackFields)
-                    clientSocket.sendall(response.encode())
+        if missing:
 
-                    logging.info("---- Order Replaced ----")
-                    logging.info("< " + response.replace(SOH, '|'))
-
-                    if self.scenarioEngine and self.sessionConfig:
-
-                        orderObj = {
-                            "clOrdID": newClOrdId,
-                            "symbol" : symbol,
-                            "side"   : side,
-                            "qty"    : qty,
-                            "price"  : price,
-                            "server" : self,
-                        }
+            logging.info("---- Replace Reject (missing tag %s %s) ----", missing, requiredTags[missing])
 
-                        chosenBehavior = self.sessionConfig["execution"]["defaultBehavior"]
+            self._sendReject(pendingOut, fixFields, nextSeq, missing, "1", f"Required tag {missing} ({requiredTags[missing]}) missing in ReplaceRequest")
+            return
 
-                        for rule in self.sessionConfig["execution"]["rules"]:
-                            if rule["matchFn"](symbol):
-                                chosenBehavior = rule["behavior"]
-                                break
+        # validation — ClOrdID reuse
 
-                        logging.info(f"[SCENARIO] (REPLACE) Symbol={symbol} → Behavior={chosenBehavior}")
+        if newClOrdId in self.orders:
+            logging.info("---- Replace Reject (duplicate ClOrdID %s) ----", newClOrdId)
 
-                        self.scenarioEngine.runBehavior(orderObj, chosenBehavior)
+            self._sendOrderReject(pendingOut, nextSeq, newClOrdId, origClOrdId, "Duplicate ClOrdID on Replace Request")
+            return
 
-                else:
+        # validation - lookup using OLD ClOrdID (origClOrdId)
 
-                    logging.info(f"--- Unsupported MsgType {msgType} ---")
-                    logging.info("> " + message.replace(SOH, '|'))
+        order = self.orders.get(origClOrdId)
 
-        clientSocket.close()
-        logging.info("--- Connection closed ---")
+        if not order:
+
+            logging.info("---- Replace Reject (unknown order %s) ----", origClOrdId)
+
+            self._sendOrderReject(pendingOut, nextSeq, newClOrdId, origClOrdId, "Unknown order / unable to replace")
+            return
+
+        # validation — invalid qty
+
+        if not self._isPositiveDecimal(qty):
+
+            logging.info("---- Replace Reject (invalid OrderQty) ----")
+
+            self._sendReject(pendingOut, fixFields, nextSeq, "38", "5", "OrderQty must be a positive number for Replace request")
+            return
+
+        # validation — invalid price for Limit
+
+        if ordType == "2" and not self._isPositiveDecimal(price):
+
+            logging.info("---- Replace Reject (invalid Price) ----")
+
+            self._sendReject(pendingOut, fixFields, nextSeq, "44", "5", "Price must be positive for Limit Replace")
+            return
+
+        # apply the replace values
+
+        oldKey = origClOrdId
+
+        order["qty"]     = qty
+        order["price"]   = price
+        order["ordType"] = ordType
+        order["side"]    = side
+        order["symbol"]  = symbol
+
+        order["currentClOrdId"] = newClOrdId
+        order["lastClOrdId"]    = newClOrdId
+        order["history"].append(newClOrdId)
+
+        # update dictionary - re-key the same order object (only the key
+        # entry moves, the record itself is not copied)
+
+        self.orders[newClOrdId] = self.orders.pop(oldKey)
+
+        # ack - send the ack message
+
+        now, idStamp = self._stampNow()
+        execId  = "EX" + idStamp
+        orderId = order["orderId"]
+
+        response = BuildFromTemplate(self.replaceAckTmpl, (
+            orderId, execId, newClOrdId, origClOrdId, side, qty, symbol, ordType, price, now, nextSeq
+        ))
+        pendingOut.append(response)
+
+        logging.info("---- Order Replaced ----")
+        if logTraffic:
+            logging.info("< " + response.decode().replace(SOH, '|'))
+
+        scenarioObj = order.get("scenarioObj")
+
+        if scenarioObj and scenarioObj.get("waitingFor") == "replace":
+
+            # scenario blocked in wait_for: replace - hand it the replace
+            scenarioObj["clOrdID"] = newClOrdId
+            scenarioObj["qty"]     = qty
+            scenarioObj["price"]   = price
+
+            logging.info("[SCENARIO] (REPLACE) signalling running scenario for %s", newClOrdId)
+
+            self.scenarioEngine.signal(scenarioObj, "replace")
+
+        elif self.scenarioEngine and self.sessionConfig:
+            # not waiting for it - the replaced order gets a fresh behavior
+            self._stopScenario(order)
+            self._startScenario(order, newClOrdId, "(REPLACE) ")
 
     #
     # session messages
@@ -1014,24 +1383,15 @@ class FixEmulatorServer:
     # Description : Build and return FIX Logon message. (35=A)
     #
     # Input       : incomingMsg - dictionary of parsed FIX fields from client
+    #             : nextSeq     - reply MsgSeqNum (1 for the session's first message)
     #
-    # Returns     : string - Encoded FIX Logon message (35=A)
+    # Returns     : bytes - framed FIX Logon message (35=A), ready to write
     #
     ###############################################################################
 
-    def BuildLogonResponse(self, incomingMsg):
+    def BuildLogonResponse(self, incomingMsg, nextSeq=1):
 
-        fields = {
-            "35" : "A",
-            "34" : "1",
-            "49" : self.senderCompID,
-            "56" : self.targetCompID,
-            "52" : datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-            "98" : "0",
-            "108": str(self.heartBtInt),
-        }
-
-        return BuildFixMessage(fields)
+        return BuildFromTemplate(self.logonTmpl, (nextSeq, FixTimestamp()))
 
 
     ###############################################################################
@@ -1041,22 +1401,15 @@ class FixEmulatorServer:
     # Description : Build and return FIX Heartbeat response. (35=0)
     #
     # Input       : incomingMsg - dictionary of parsed FIX fields from client
+    #             : nextSeq     - reply MsgSeqNum, derived from incomingMsg if None
     #
-    # Returns     : string - Encoded FIX Heartbeat message (35=0)
+    # Returns     : bytes - framed FIX Heartbeat message (35=0), ready to write
     #
     ###############################################################################
 
-    def BuildHeartbeatResponse(self, incomingMsg):
-
-        fields = {
-            "35": "0",
-            "34": str(int(incomingMsg.get("34", "0")) + 1),
-            "49": self.senderCompID,
-            "56": self.targetCompID,
-            "52": datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-        }
+    def BuildHeartbeatResponse(self, incomingMsg, nextSeq=None):
 
-        return BuildFixMessage(fields)
+        return BuildFromTemplate(self.heartbeatTmpl, (nextSeq or self._replySeq(incomingMsg), FixTimestamp()))
 
 
     ###############################################################################
@@ -1066,19 +1419,12 @@ class FixEmulatorServer:
     # Description : Build and return FIX Logout. (35=5) 
     #
     # Input       : incomingMsg - dictionary of parsed FIX fields from client
+    #             : nextSeq     - reply MsgSeqNum, derived from incomingMsg if None
     #
-    # Returns     : string - Encoded FIX Logout message (35=5)
+    # Returns     : bytes - framed FIX Logout message (35=5), ready to write
     #
     ###############################################################################
 
-    def BuildLogoutResponse(self, incomingMsg):
-
-        fields = {
-            "35": "5", 
-            "34": str(int(incomingMsg.get("34", "0")) + 1),
-            "49": self.senderCompID,
-            "56": self.targetCompID,
-            "52": datetime.utcnow().strftime("%Y%m%d-%H:%M:%S.%f")[:-3],
-        }
+    def BuildLogoutResponse(self, incomingMsg, nextSeq=None):
 
-        return BuildFixMessage(fields)
+        return BuildFromTemplate(self.logoutTmpl, (nextSeq or self._replySeq(incomingMsg), FixTimestamp()))
@@ -0,0 +1,210 @@
+#
+#     Title    : test_configloader.py
+#     Version  : 1.0
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#
+#     Function : Checks for ConfigLoader caching and symbol lookup.
+#              : - parsed yaml is reused until the file's mtime changes.
+#              : - the json sidecar is reused, rebuilt when any yaml
+#              :   (subdirectories too) changes, and stale ones removed.
+#              : - LazySessions only compiles sessions that are looked up.
+#              : - compileLookup keeps first-match-wins rule order.
+#
+#     Run      : python -m unittest discover tests
+#
+#     Modification History
+#
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#     Changes  : New file.
+#
+#     Date     :
+#     Author   :
+#     Changes  :
+#
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from ConfigLoader import CachedSession, ConfigLoader
+
+CONFIGS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs")
+
+
+def Touch(path, text=None):
+
+    # edit (optionally) and move the mtime forward - no sleep on coarse clocks
+    if text is not None:
+        with open(path, "w") as file:
+            file.write(text)
+
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp        = tempfile.mkdtemp()
+        self.configPath = os.path.join(self.tmp, "configs")
+
+        shutil.copytree(CONFIGS, self.configPath, ignore=shutil.ignore_patterns(".cache-*"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _sidecars(self):
+        return glob.glob(os.path.join(self.configPath, ".cache-*.json"))
+
+    def testYamlReparsedOnlyOnChange(self):
+
+        loader = ConfigLoader(self.configPath, useCache=False)
+        first  = loader._loadYaml("engine.yaml")
+
+        self.assertIs(loader._loadYaml("engine.yaml"), first)
+
+        Touch(os.path.join(self.configPath, "engine.yaml"))
+
+        self.assertIsNot(loader._loadYaml("engine.yaml"), first)
+        self.assertEqual(loader._loadYaml("engine.yaml"), first)
+
+    def testSidecarReusedThenInvalidated(self):
+
+        fresh = ConfigLoader(self.configPath).loadAll()["sessions"]["equities"]
+
+        self.assertEqual(len(self._sidecars()), 1)
+
+        # warm start - no yaml parsed, nothing compiled from the session file
+        warmLoader = ConfigLoader(self.configPath)
+        warmLoader.loadSession = None
+        warmLoader._loadYaml   = None
+
+        warm = warmLoader.loadAll()["sessions"]["equities"]
+
+        self.assertIsInstance(warm, CachedSession)
+        self.assertEqual(warm["connection"], fresh["connection"])
+        self.assertEqual(warm["execution"]["lookupFn"]("AAPL"), fresh["execution"]["lookupFn"]("AAPL"))
+
+        # session yaml edited - new key, recompiled, old sidecar removed
+        sessionPath = os.path.join(self.configPath, "equities.yaml")
+
+        with open(sessionPath) as file:
+            text = file.read()
+
+        Touch(sessionPath, text.replace("port: 9898", "port: 9797"))
+
+        oldSidecars = self._sidecars()
+        edited      = ConfigLoader(self.configPath).loadAll()["sessions"]["equities"]
+
+        self.assertEqual(edited["connection"]["port"], 9797)
+        self.assertEqual(len(self._sidecars()), 1)
+        self.assertNotEqual(self._sidecars(), oldSidecars)
+
+    def testSubdirectorySessionInvalidates(self):
+
+        os.makedirs(os.path.join(self.configPath, "desk"))
+        os.replace(os.path.join(self.configPath, "equities.yaml"), os.path.join(self.configPath, "desk", "equities.yaml"))
+
+        enginePath = os.path.join(self.configPath, "engine.yaml")
+
+        with open(enginePath) as file:
+            text = file.read()
+
+        Touch(enginePath, text.replace('"equities.yaml"', '"desk/equities.yaml"'))
+
+        loader = ConfigLoader(self.configPath)
+        before = loader._cacheKey()
+
+        Touch(os.path.join(self.configPath, "desk", "equities.yaml"))
+
+        self.assertNotEqual(loader._cacheKey(), before)
+
+    def testRawProfileNotCached(self):
+
+        fresh = ConfigLoader(self.configPath).loadAll()["sessions"]["equities"]
+        warm  = ConfigLoader(self.configPath).loadAll()["sessions"]["equities"]
+
+        self.assertNotIn("rawProfile", warm)
+        self.assertEqual(warm["rawProfile"], fresh["rawProfile"])
+
+    def testSessionsAreLazy(self):
+
+        sessions = ConfigLoader(self.configPath, useCache=False).loadAll()["sessions"]
+
+        self.assertEqual(list(sessions), ["equities"])
+        self.assertEqual(sessions.loaded, {})
+
+        session = sessions["equities"]
+
+        self.assertIs(sessions["equities"], session)
+        self.assertRaises(KeyError, lambda: sessions["missing"])
+
+    def testPreloadLoadsEverySession(self):
+
+        bundle = ConfigLoader(self.configPath).loadAll(preload=True)
+
+        self.assertEqual(list(bundle["sessions"].loaded), ["equities"])
+        self.assertEqual(len(self._sidecars()), 1)
+
+
+class LookupTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.loader    = ConfigLoader(CONFIGS, useCache=False)
+        self.behaviors = {name: {} for name in ("specific", "prefix", "catchAll", "other")}
+
+    def _lookup(self, rules):
+
+        compiled = self.loader.compileRules([{"match": m, "behavior": b} for m, b in rules], self.behaviors)
+
+        return compiled, self.loader.compileLookup(compiled)
+
+    def _walk(self, compiled, symbol):
+
+        # reference - the rule list walked in order
+        for rule in compiled:
+            if rule["matchFn"](symbol):
+                return rule["behavior"]
+
+        return None
+
+    def testFirstMatchWins(self):
+
+        _, lookupFn = self._lookup([("AA*", "specific"), ("A*", "prefix"), ("*", "catchAll")])
+
+        self.assertEqual(lookupFn("AAPL"), "specific")
+        self.assertEqual(lookupFn("AMZN"), "prefix")
+        self.assertEqual(lookupFn("MSFT"), "catchAll")
+
+        # broader rule first shadows the specific one
+        _, lookupFn = self._lookup([("A*", "prefix"), ("AA*", "specific")])
+
+        self.assertEqual(lookupFn("AAPL"), "prefix")
+        self.assertIsNone(lookupFn("MSFT"))
+
+    def testMatchesRuleWalk(self):
+
+        rules    = [("B?DU", "specific"), ("[AB]*", "prefix"), ("*.L", "other"), ("G*", "catchAll")]
+        compiled, lookupFn = self._lookup(rules)
+
+        for symbol in ("BIDU", "BXDU", "BIDUU", "AAPL", "VOD.L", "GOOG", "G", "", "Z", "bidu"):
+
+            # twice - the second answer comes from the memo
+            self.assertEqual(lookupFn(symbol), self._walk(compiled, symbol), symbol)
+            self.assertEqual(lookupFn(symbol), self._walk(compiled, symbol), symbol)
+
+    def testNoRules(self):
+
+        _, lookupFn = self._lookup([])
+
+        self.assertIsNone(lookupFn("AAPL"))
+
+
+if __name__ == "__main__":
+    unittest.main()
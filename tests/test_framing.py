@@ -0,0 +1,133 @@
+#
+#     Title    : test_framing.py
+#     Version  : 1.0
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#
+#     Function : Checks for the receive-side framer and the outbound checksum.
+#              : - _frameOne with a resumed trailer scan cuts the same
+#              :   messages as a scan from offset 0, however the stream
+#              :   is chunked.
+#              : - _ByteSum (adler32 based) equals sum() at every length.
+#
+#     Run      : python -m unittest discover tests
+#
+#     Modification History
+#
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#     Changes  : New file.
+#
+#     Date     :
+#     Author   :
+#     Changes  :
+#
+
+import os
+import random
+import unittest
+
+from emulator.messageUtils import BuildFixMessage, CalculateChecksum, _ByteSum, _FrameBody
+from emulator.server       import FixEmulatorServer, SOH_B
+
+
+def FrameStream(server, chunks, resume=True):
+
+    # same cursor handling as HandleClient's read loop
+    buffer   = bytearray()
+    messages = []
+    scanFrom = 0
+
+    for chunk in chunks:
+
+        buffer += chunk
+
+        while True:
+
+            message = server._frameOne(buffer, scanFrom if resume else 0)
+
+            if message is None:
+                scanFrom = max(buffer.rfind(SOH_B), 0)
+                break
+
+            scanFrom = 0
+            messages.append(message)
+
+    return messages
+
+
+class FrameOneTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = FixEmulatorServer("127.0.0.1", 0, "FIXEM", "CLIENT1")
+
+        good  = BuildFixMessage({"35": "0", "49": "CLIENT1", "56": "FIXEM", "34": "2", "52": "20261014-10:00:00.000"})
+        bad   = good.replace(b"9=", b"9=1", 1)          # wrong BodyLength - trailer fallback
+        noise = b"\x01\x01junk"                         # dropped before 8=FIX
+
+        self.good   = good
+        self.stream = (good + bad + noise + good + bad + good) * 3
+
+    def testWholeStream(self):
+
+        messages = FrameStream(self.server, [self.stream])
+
+        self.assertEqual(len(messages), 15)
+        self.assertTrue(all(m.startswith(b"8=FIX.4.2\x01") and m.endswith(SOH_B) for m in messages))
+
+    def testRandomChunkings(self):
+
+        expected = FrameStream(self.server, [self.stream])
+        rng      = random.Random(4)
+
+        for _ in range(300):
+
+            chunks = []
+            idx    = 0
+
+            while idx < len(self.stream):
+                size = rng.choice((1, 1, 2, 3, 7, 50, 200))
+                chunks.append(self.stream[idx:idx + size])
+                idx += size
+
+            self.assertEqual(FrameStream(self.server, chunks), expected)
+            self.assertEqual(FrameStream(self.server, chunks, resume=False), expected)
+
+    def testByteAtATime(self):
+
+        chunks = [bytes((b,)) for b in self.stream]
+
+        self.assertEqual(FrameStream(self.server, chunks), FrameStream(self.server, [self.stream]))
+
+    def testPartialMessageWaits(self):
+
+        buffer = bytearray(self.good[:-1])
+
+        self.assertIsNone(self.server._frameOne(buffer))
+        self.assertEqual(bytes(buffer), self.good[:-1])
+
+
+class ByteSumTest(unittest.TestCase):
+
+    def testMatchesSum(self):
+
+        rng = random.Random(20)
+
+        # no mod 65521 inside a chunk up to 256 bytes - check both sides of it
+        for length in list(range(0, 600)) + [5000, 70000]:
+
+            for data in (bytes(rng.getrandbits(8) for _ in range(length)), b"\xff" * length):
+                self.assertEqual(_ByteSum(data), sum(data), length)
+
+    def testChecksumTrailer(self):
+
+        message = _FrameBody(b"35=0\x0134=1\x01" + os.urandom(300).replace(SOH_B, b"x") + SOH_B)
+        body    = message[:message.rindex(b"10=")]
+
+        self.assertTrue(message.endswith(b"10=%03d\x01" % (sum(body) & 0xFF)))
+        self.assertEqual(CalculateChecksum(body), sum(body) & 0xFF)
+
+
+if __name__ == "__main__":
+    unittest.main()
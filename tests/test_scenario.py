@@ -0,0 +1,127 @@
+#
+#     Title    : test_scenario.py
+#     Version  : 1.0
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#
+#     Function : Checks for ScenarioEngine wait_for and signal handling.
+#              : - a wait_for that times out stops the behavior and
+#              :   clears waitingFor.
+#              : - signal() wakes a waiting step, and one sent before the
+#              :   step is latched.
+#              : - cancelling the scheduled future stops the behavior.
+#              : - schedule()/signal() work from outside the scenario loop.
+#
+#     Run      : python -m unittest discover tests
+#
+#     Modification History
+#
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#     Changes  : New file.
+#
+#     Date     :
+#     Author   :
+#     Changes  :
+#
+
+import asyncio
+import unittest
+
+from ScenarioEngine import ScenarioEngine
+
+
+class RecordingServer:
+
+    # stands in for FixEmulatorServer - records each scenario send
+    def __init__(self):
+        self.sent = []
+
+    def HandleScenarioAction(self, orderObj, msgType):
+        self.sent.append(msgType)
+
+
+BEHAVIORS = {
+    "wait_cancel": {"scenario": [{"send": "ack"}, {"wait_for": "cancel", "timeout": 50}, {"send": "cancel_ack"}]},
+    "slow_fill":   {"scenario": [{"send": "ack"}, {"delay": 10000}, {"send": "fill"}]},
+}
+
+
+def NewOrder(server, clOrdId="ORD1"):
+    return {"clOrdID": clOrdId, "server": server}
+
+
+class WaitForTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+
+        self.engine = ScenarioEngine(BEHAVIORS)
+        self.server = RecordingServer()
+        self.order  = NewOrder(self.server)
+
+    async def testTimeoutStopsBehavior(self):
+
+        await self.engine.schedule(self.order, "wait_cancel")
+
+        self.assertEqual(self.server.sent, ["ack"])
+        self.assertIsNone(self.order["waitingFor"])
+        self.assertFalse(self.order["running"])
+
+    async def testSignalWakesWait(self):
+
+        future = self.engine.schedule(self.order, "wait_cancel")
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(self.order["waitingFor"], "cancel")
+
+        self.engine.signal(self.order, "cancel")
+        await future
+
+        self.assertEqual(self.server.sent, ["ack", "cancel_ack"])
+        self.assertIsNone(self.order["waitingFor"])
+
+    async def testSignalBeforeWaitIsLatched(self):
+
+        self.engine.signal(self.order, "cancel")
+
+        await asyncio.wait_for(self.engine.schedule(self.order, "wait_cancel"), 1)
+
+        self.assertEqual(self.server.sent, ["ack", "cancel_ack"])
+        self.assertFalse(self.order["events"]["cancel"].is_set())
+
+    async def testCancelStopsBehavior(self):
+
+        future = self.engine.schedule(self.order, "slow_fill")
+        await asyncio.sleep(0.01)
+
+        future.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await future
+
+        self.assertEqual(self.server.sent, ["ack"])
+        self.assertFalse(self.order["running"])
+        self.assertEqual(self.engine.tasks, set())
+
+
+class BackgroundLoopTest(unittest.TestCase):
+
+    def tearDown(self):
+        self.engine.loop.call_soon_threadsafe(self.engine.loop.stop)
+
+    def testScheduleAndSignalFromThread(self):
+
+        self.engine = ScenarioEngine(BEHAVIORS)
+        server      = RecordingServer()
+        order       = NewOrder(server)
+
+        # no running loop here - the first signal() starts the background one
+        self.engine.signal(order, "cancel")
+        self.engine.schedule(order, "wait_cancel").result(timeout=1)
+
+        self.assertIsNotNone(self.engine.loopThread)
+        self.assertEqual(server.sent, ["ack", "cancel_ack"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#
+#     Title    : test_server.py
+#     Version  : 1.0
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#
+#     Function : Checks for FixEmulatorServer order handling.
+#              : - OrderQty/Price accept plain ASCII decimals only, the
+#              :   same on NewOrderSingle (D) and Replace (G).
+#              : - one gap-free, in-order MsgSeqNum series per session
+#              :   across replies and coalesced scenario execs.
+#
+#     Run      : python -m unittest discover tests
+#
+#     Modification History
+#
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#     Changes  : New file.
+#
+#     Date     :
+#     Author   :
+#     Changes  :
+#
+
+import asyncio
+import os
+import re
+import unittest
+
+from ConfigLoader          import ConfigLoader
+from ScenarioEngine        import ScenarioEngine
+from emulator.messageUtils import BuildFixMessage, ParseFixMessage
+from emulator.server       import FixEmulatorServer
+
+CONFIGS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs")
+
+
+def NewOrder(clOrdId, qty="100", price="10.5"):
+    return {"35": "D", "34": "2", "11": clOrdId, "54": "1", "38": qty, "55": "AAPL", "40": "2", "44": price}
+
+
+def Replace(clOrdId, origClOrdId, qty="200", price="11"):
+    return {"35": "G", "34": "3", "11": clOrdId, "41": origClOrdId, "54": "1", "38": qty, "55": "AAPL", "40": "2", "44": price}
+
+
+class DecimalValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FixEmulatorServer("127.0.0.1", 0, "FIXEM", "CLIENT1")
+
+    def _send(self, handler, fixFields):
+
+        pendingOut = []
+        handler(None, pendingOut, fixFields, 1, b"", False)
+
+        return [ParseFixMessage(m) for m in pendingOut]
+
+    def testPositiveDecimal(self):
+
+        accepted = ("1", "100", "10.5", "0.25", "007")
+        rejected = ("", None, "0", "0.0", ".", "-5", "+5", "1e2", "nan", "inf", "1.2.3", " 1",
+                    "١٠٠",          # Arabic-Indic digits
+                    "１００",        # fullwidth digits
+                    "1٠")           # ASCII digit + Arabic-Indic zero
+
+        for value in accepted:
+            self.assertTrue(self.server._isPositiveDecimal(value), value)
+
+        for value in rejected:
+            self.assertFalse(self.server._isPositiveDecimal(value), value)
+
+    def testNewOrderAndReplaceAgree(self):
+
+        self.assertEqual(self._send(self.server._handleNewOrder, NewOrder("ORD1"))[0]["150"], "0")
+
+        for qty in ("١٠٠", "１００", "nan", "1e2"):
+
+            nos = self._send(self.server._handleNewOrder, NewOrder("N" + qty, qty=qty))
+            rpl = self._send(self.server._handleReplace, Replace("R" + qty, "ORD1", qty=qty))
+
+            for reply in (nos[0], rpl[0]):
+                self.assertEqual((reply["35"], reply["371"]), ("3", "38"), qty)
+
+            self.assertNotIn("N" + qty, self.server.orders)
+
+        nos = self._send(self.server._handleNewOrder, NewOrder("ORD2", price="１０"))
+        self.assertEqual((nos[0]["35"], nos[0]["371"]), ("3", "44"))
+
+
+class SessionSeqTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+
+        bundle  = ConfigLoader(CONFIGS, useCache=False).loadAll()
+        session = bundle["sessions"]["equities"]
+
+        self.server = FixEmulatorServer("127.0.0.1", 0, "FIXEM", "CLIENT1",
+                                        scenarioEngine=ScenarioEngine(bundle["behaviors"]), sessionConfig=session)
+        self.serve  = asyncio.create_task(self.server.Start())
+
+        while self.server.server is None:
+            await asyncio.sleep(0.01)
+
+        self.port = self.server.server.sockets[0].getsockname()[1]
+        self.seq  = 0
+
+    async def asyncTearDown(self):
+
+        self.serve.cancel()
+
+        try:
+            await self.serve
+        except asyncio.CancelledError:
+            pass
+
+    def _message(self, msgType, *fields):
+
+        self.seq += 1
+
+        return BuildFixMessage({"35": msgType, "49": "CLIENT1", "56": "FIXEM", "34": self.seq,
+                                "52": "20261014-10:00:00.000", **dict(fields)})
+
+    def _order(self, clOrdId, symbol):
+        return self._message("D", ("11", clOrdId), ("54", "1"), ("38", "100"), ("55", symbol), ("40", "2"), ("44", "10"))
+
+    async def _readFor(self, reader, seconds):
+
+        data = b""
+        loop = asyncio.get_running_loop()
+        end  = loop.time() + seconds
+
+        while loop.time() < end:
+            try:
+                data += await asyncio.wait_for(reader.read(65536), end - loop.time())
+            except asyncio.TimeoutError:
+                break
+
+        return data
+
+    async def testSeqAcrossRepliesAndScenarioExecs(self):
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        writer.write(self._message("A", ("98", "0"), ("108", "30")))
+
+        # one batch - three acks, then AAPL/AMZN (full_fill) fire in the same
+        # tick and BIDU (partial_then_full) twice later, all between replies
+        writer.write(self._order("O1", "AAPL") + self._order("O2", "BIDU") + self._order("O3", "AMZN") + self._message("0"))
+        data = await self._readFor(reader, 0.2)
+
+        writer.write(self._message("0"))
+        data += await self._readFor(reader, 0.6)
+
+        writer.write(self._message("5"))
+        data += await self._readFor(reader, 0.2)
+
+        writer.close()
+        await writer.wait_closed()
+
+        seqs  = [int(seq) for seq in re.findall(rb"\x0134=(\d+)\x01", data)]
+        execs = re.findall(rb"\x0135=8\x01150=([0-9])", data)
+
+        # logon + 3 acks + 2 heartbeats + 4 scenario execs + logout
+        self.assertEqual(seqs, list(range(1, 12)))
+        self.assertEqual(sorted(execs), sorted([b"0", b"0", b"0", b"2", b"1", b"2", b"2"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#
+#     Title    : test_validator.py
+#     Version  : 1.0
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#
+#     Function : Checks for the certification validator.
+#              : - IterValidate yields the same results, in the same order,
+#              :   as LoadLog/ParseMessages/ValidateMessages.
+#              : - a spec applied to another MsgType's message does not
+#              :   seed that type's allowed-tag cache.
+#
+#     Run      : python -m unittest discover tests
+#
+#     Modification History
+#
+#     Date     : 14 October 2026
+#     Author   : Daniel Gavin
+#     Changes  : New file.
+#
+#     Date     :
+#     Author   :
+#     Changes  :
+#
+
+import os
+import tempfile
+import unittest
+
+from cert.validator import NEW_ORDER_SPEC, BuildSpec, CertificationValidator
+
+HEADER = "8=FIX.4.2|9=100|49=CLIENT1|56=FIXEM|34=2|52=20261014-10:00:00.000"
+ORDER  = HEADER + "|35=D|11=ORD1|21=1|55=AAPL|54=1|38=100|40=2|60=20261014-10:00:00|10=000"
+
+LOG_LINES = [
+    HEADER + "|35=A|98=0|108=30|10=000",
+    ORDER,
+    ORDER + "|44=10.5|9140=X",                      # custom tags for D
+    ORDER + "|9999=X|48=1",                         # unexpected tag, half a pair
+    ORDER.replace("|55=AAPL", ""),                  # missing required tag
+    "",
+    "8=FIX.4.2|9=5|49=CLIENT1|10=000",              # no MsgType
+    HEADER + "|35=8|11=ORD1|17=E1|150=0|39=0|55=AAPL|54=1|38=100|40=2|44=10|14=0|6=0|20=0|10=000",
+    HEADER + "|35=Z|10=000",                        # unknown MsgType
+    (HEADER + "|35=5|58=bye|10=000").replace("|", "\x01"),
+]
+
+
+class ValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+
+        handle, self.logFile = tempfile.mkstemp(suffix=".log")
+
+        with os.fdopen(handle, "w") as file:
+            file.write("\n".join(LOG_LINES) + "\n")
+
+    def tearDown(self):
+        os.remove(self.logFile)
+
+    def testIterValidateMatchesBatch(self):
+
+        batch = CertificationValidator(self.logFile)
+        batch.LoadLog()
+        batch.ParseMessages()
+
+        # batch reports skipped lines first, streaming reports them in place
+        expected = batch.ValidateMessages()
+        streamed = list(CertificationValidator(self.logFile).IterValidate())
+
+        self.assertEqual(sorted(streamed), sorted(expected))
+        self.assertEqual([r for r in streamed if r[0] != "❌"], [r for r in expected if r[0] != "❌"])
+        self.assertEqual(streamed[5], ("❌", "Message skipped: Missing tag 35 (MsgType)"))
+
+        results = dict(r for r in streamed if r[0] != "❌")
+
+        self.assertEqual(results["Line 2"], "✅ Valid NewOrderSingle")
+        self.assertEqual(results["Line 3"], "✅ Valid NewOrderSingle")
+        self.assertEqual(results["Line 4"], "❌ NewOrderSingle unexpected tag(s): 9999, 48; 48/22 must both be present")
+        self.assertEqual(results["Line 5"], "❌ NewOrderSingle missing required tag(s): 55")
+        self.assertEqual(results["Line 6"], "✅ Valid ExecutionReport")
+        self.assertTrue(results["Line 7"].startswith("⚠️  Unknown MsgType: Z"))
+        self.assertEqual(results["Line 8"], "✅ Valid Logout")
+
+    def testMissingLog(self):
+
+        validator = CertificationValidator(self.logFile + ".missing")
+
+        self.assertRaises(FileNotFoundError, validator.IterValidate)
+        self.assertRaises(FileNotFoundError, validator.LoadLog)
+
+    def testCrossTypeSpecKeepsCachesApart(self):
+
+        validator  = CertificationValidator(self.logFile)
+        order      = validator.ParseLine(ORDER.encode())
+        execReport = dict(order, **{"35": "8", "20": "0"})
+
+        # NewOrderSingle spec on an ExecutionReport - 20 is custom for 8 only
+        self.assertEqual(validator.ValidateNewOrder(execReport), "✅ Valid NewOrderSingle")
+        self.assertNotIn(("NewOrderSingle", "D"), validator.allowedByType)
+
+        self.assertEqual(validator.ValidateNewOrder(dict(order, **{"20": "0"})), "❌ NewOrderSingle unexpected tag(s): 20")
+        self.assertIn("20", validator.allowedByType[("NewOrderSingle", "8")])
+        self.assertNotIn("20", validator.allowedByType[("NewOrderSingle", "D")])
+
+    def testBuildSpec(self):
+
+        label, required, allowed, conditionals, conditionalTags, requiredSet = BuildSpec("X", ["1", "2"], ["3"], [("4", "5")])
+
+        self.assertEqual((label, required, conditionals), ("X", ("1", "2"), (("4", "5"),)))
+        self.assertEqual((allowed, conditionalTags, requiredSet), ({"1", "2", "3"}, {"4", "5"}, {"1", "2"}))
+        self.assertTrue(NEW_ORDER_SPEC[5] <= NEW_ORDER_SPEC[2])
+
+
+if __name__ == "__main__":
+    unittest.main()